@@ -1,47 +1,202 @@
-import os, sys
+import importlib
+import importlib.util
+import logging
 import streamlit as st
-import base64
 from streamlit_option_menu import option_menu
-from employee_app import render_employee_tool
-
-# Import the foundation data management wrapper
-try:
-    from foundation_data_wrapper import render_foundation_data_management, get_foundation_system_status
-    FOUNDATION_WRAPPER_AVAILABLE = True
-except ImportError as e:
-    FOUNDATION_WRAPPER_AVAILABLE = False
-    print(f"Foundation wrapper not available: {e}")
-    # Fallback to old foundation system
-    try:
-        from foundation_module.foundation_app import render as render_foundation
-        OLD_FOUNDATION_AVAILABLE = True
-    except ImportError:
-        OLD_FOUNDATION_AVAILABLE = False
-
-# Import the employee data management wrapper
-try:
-    from employee_data_wrapper import render_employee_data_management, get_employee_system_status
-    EMPLOYEE_WRAPPER_AVAILABLE = True
-except ImportError as e:
-    EMPLOYEE_WRAPPER_AVAILABLE = False
-    print(f"Employee wrapper not available: {e}")
-
-# Import the payroll data management wrapper
-try:
-    from payroll_data_wrapper import render_payroll_data_management, get_payroll_system_status
-    PAYROLL_WRAPPER_AVAILABLE = True
-except ImportError as e:
-    PAYROLL_WRAPPER_AVAILABLE = False
-    print(f"Payroll wrapper not available: {e}")
-    # Fallback to old payroll system
+
+log = logging.getLogger(__name__)
+
+# Page setup
+st.set_page_config(layout="wide", page_title="Data Tool", page_icon="⚙️")
+
+# Wrapper entry points are imported on first use so the Dashboard never pays
+# for loading pandas/plotly through the data management wrappers
+_LAZY = {
+    "render_foundation_data_management": ("foundation_data_wrapper", "render_foundation_data_management"),
+    "get_foundation_system_status": ("foundation_data_wrapper", "get_foundation_system_status"),
+    "render_employee_data_management": ("employee_data_wrapper", "render_employee_data_management"),
+    "get_employee_system_status": ("employee_data_wrapper", "get_employee_system_status"),
+    "render_payroll_data_management": ("payroll_data_wrapper", "render_payroll_data_management"),
+    "get_payroll_system_status": ("payroll_data_wrapper", "get_payroll_system_status"),
+    # Legacy fallbacks
+    "render_foundation": ("foundation_module.foundation_app", "render"),
+    "render_payroll_tool": ("payroll.app", "render_payroll_tool"),
+}
+
+def _lazy(name):
+    """Resolve a wrapper entry point on demand, or None if its module fails to import"""
+    # app.py globals are rebuilt on every rerun, so resolved callables live in the session
+    resolved = st.session_state.setdefault("_lazy_entry_points", {})
+    if name not in resolved:
+        module_name, attr = _LAZY[name]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            # Remembered as None so later reruns neither retry the import nor repeat the warning
+            log.warning("%s not available: %s", module_name, e)
+            resolved[name] = None
+        else:
+            resolved[name] = getattr(module, attr)
+    return resolved[name]
+
+def _available(module_name):
+    """Check that a module can be found without executing it"""
     try:
-        from payroll import app as payroll_app
-        OLD_PAYROLL_AVAILABLE = True
-    except ImportError:
-        OLD_PAYROLL_AVAILABLE = False
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        # Parent package of a dotted name is missing
+        return False
+
+# Probe once per session; find_spec walks sys.path on every call
+if "module_availability" not in st.session_state:
+    st.session_state.module_availability = {
+        module_name: _available(module_name)
+        for module_name in (
+            "foundation_data_wrapper",
+            "employee_data_wrapper",
+            "payroll_data_wrapper",
+            "foundation_module.foundation_app",
+            "payroll.app",
+        )
+    }
+
+FOUNDATION_WRAPPER_AVAILABLE = st.session_state.module_availability["foundation_data_wrapper"]
+EMPLOYEE_WRAPPER_AVAILABLE = st.session_state.module_availability["employee_data_wrapper"]
+PAYROLL_WRAPPER_AVAILABLE = st.session_state.module_availability["payroll_data_wrapper"]
+OLD_FOUNDATION_AVAILABLE = st.session_state.module_availability["foundation_module.foundation_app"]
+OLD_PAYROLL_AVAILABLE = st.session_state.module_availability["payroll.app"]
+
+# Dashboard module status lines, keyed by wrapper availability
+_MODULE_STATUS = {
+    True: """
+            <div style='font-size: 0.8rem; color: rgba(255,255,255,0.7); margin-top: 0.5rem;'>
+                <span class='status-indicator status-online'></span>
+                Enhanced Processing Available
+            </div>
+        """,
+    False: """
+            <div style='font-size: 0.8rem; color: rgba(255,255,255,0.7); margin-top: 0.5rem;'>
+                <span class='status-indicator status-offline'></span>
+                Legacy System
+            </div>
+        """,
+}
+
+# Data Tools module cards, built once per session since they only depend on availability
+def _module_card(title, description, available):
+    return f"""
+                <div class='module-card'>
+                    <div class='module-title'>{title}</div>
+                    <div class='module-description'>
+                        {description}
+                    </div>
+                    <div style='margin-top: 1rem; font-size: 0.8rem;'>
+                        <span class='status-indicator status-{"online" if available else "offline"}'></span>
+                        {"Enhanced System" if available else "Legacy System"}
+                    </div>
+                </div>
+            """
+
+if "module_cards_html" not in st.session_state:
+    st.session_state.module_cards_html = {
+        "foundation": _module_card(
+            "Foundation Data",
+            "Enhanced organizational hierarchy processing with HRP1000/HRP1001 support" if FOUNDATION_WRAPPER_AVAILABLE
+            else "Organizational structure and hierarchy management",
+            FOUNDATION_WRAPPER_AVAILABLE,
+        ),
+        "employee": _module_card(
+            "Employee Data",
+            "Complete employee information processing with PA0001/PA0002/PA0006/PA0105 files" if EMPLOYEE_WRAPPER_AVAILABLE
+            else "Employee personal and job information management",
+            EMPLOYEE_WRAPPER_AVAILABLE,
+        ),
+        "payroll": _module_card(
+            "Payroll Data",
+            "Advanced payroll processing with PA0008/PA0014 wage type validation" if PAYROLL_WRAPPER_AVAILABLE
+            else "Payroll and compensation data management",
+            PAYROLL_WRAPPER_AVAILABLE,
+        ),
+    }
+
+# Dashboard metric cards, laid out by a CSS grid so all four ship in one markdown element.
+# Built without newlines: a blank line would end the HTML block in markdown.
+_METRIC_CARD_TMPL = (
+    "<div class='status-card'>"
+    "<div class='metric-large'>%d</div>"
+    "<div class='metric-label'>%s</div>"
+    "<div class='progress-container'>"
+    "<div class='progress-bar progress-%s' style='width: %d%%;'></div>"
+    "</div>"
+    "</div>"
+)
+
+def _card(value, label, level, pct):
+    return _METRIC_CARD_TMPL % (value, label, level, pct)
+
+# (value, label, progress level, progress width %)
+_DASHBOARD_METRICS = (
+    (156, "Total Records", "success", 85),
+    (142, "Processed", "success", 91),
+    (11, "Warnings", "warning", 20),
+    (3, "Errors", "error", 15),
+)
+
+_DASHBOARD_METRICS_HTML = (
+    "<div class='metric-grid'>"
+    + "".join(_card(*metric) for metric in _DASHBOARD_METRICS)
+    + "</div>"
+)
+
+def _markdown_table(headers, rows):
+    """Build a static markdown table, avoiding the Arrow round-trip of st.dataframe"""
+    lines = ["| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    lines += ["| " + " | ".join(row) + " |" for row in rows]
+    return "\n".join(lines)
+
+_RECENT_ACTIVITY_TABLE = _markdown_table(
+    ("Time", "Module", "Action", "Status"),
+    (
+        ("14:32", "Foundation", "Data Validation", "✅ Complete"),
+        ("14:15", "Employee", "File Upload", "⚠️ Warning"),
+        ("13:45", "Payroll", "Mapping Rules", "🔄 Processing"),
+        ("13:22", "Foundation", "Export Data", "✅ Complete"),
+    ),
+)
+
+_CONNECTIONS_TABLE = _markdown_table(
+    ("System", "Status", "Last Sync"),
+    (
+        ("SAP HCM", "Connected", "2 min ago"),
+        ("SuccessFactors", "Connected", "5 min ago"),
+        ("S/4HANA", "Disconnected", "Never"),
+    ),
+)
+
+# Sidebar menu styling
+_MENU_STYLES = {
+    "container": {"padding": "0px", "background-color": "transparent"},
+    "icon": {"color": "#3b82f6", "font-size": "16px"},
+    "nav-link": {
+        "font-size": "14px",
+        "text-align": "left",
+        "margin": "2px",
+        "padding": "8px 12px",
+        "background-color": "rgba(255,255,255,0.05)",
+        "border": "1px solid rgba(255,255,255,0.1)",
+        "border-radius": "6px",
+        "color": "white",
+        "--hover-color": "rgba(255,255,255,0.1)",
+    },
+    "nav-link-selected": {
+        "background": "linear-gradient(90deg, #3b82f6 0%, #2563eb 100%)",
+        "border": "1px solid #3b82f6",
+        "font-weight": "500"
+    },
+}
 
-# Professional tool styling
-st.markdown("""
+# Professional tool styling, emitted in one markdown call per run
+_CSS = """
     <style>
     /* Hide Streamlit branding */
     #MainMenu {visibility: hidden;}
@@ -57,7 +212,6 @@ st.markdown("""
     /* Main container styling */
     .main .block-container {
         background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(10px);
         border: 1px solid rgba(255, 255, 255, 0.1);
         border-radius: 12px;
         padding: 1.5rem;
@@ -86,21 +240,32 @@ st.markdown("""
         margin: 0;
     }
     
-    /* Status cards */
-    .status-card {
+    /* Metric card row */
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    
+    /* Status and module cards share their base look */
+    .status-card, .module-card {
         background: rgba(255, 255, 255, 0.08);
         border: 1px solid rgba(255, 255, 255, 0.12);
         border-radius: 8px;
-        padding: 1rem;
-        margin: 0.5rem 0;
         transition: all 0.3s ease;
     }
     
-    .status-card:hover {
+    .status-card:hover, .module-card:hover {
         background: rgba(255, 255, 255, 0.12);
         transform: translateY(-2px);
     }
     
+    /* Status cards */
+    .status-card {
+        padding: 1rem;
+        margin: 0.5rem 0;
+    }
+    
     .metric-large {
         font-size: 2rem;
         font-weight: 700;
@@ -185,19 +350,13 @@ st.markdown("""
     
     /* Module cards */
     .module-card {
-        background: rgba(255, 255, 255, 0.08);
-        border: 1px solid rgba(255, 255, 255, 0.12);
-        border-radius: 8px;
         padding: 1.5rem;
         margin: 1rem 0;
-        transition: all 0.3s ease;
         cursor: pointer;
     }
     
     .module-card:hover {
-        background: rgba(255, 255, 255, 0.12);
         border-color: #3b82f6;
-        transform: translateY(-2px);
     }
     
     .module-title {
@@ -213,10 +372,9 @@ st.markdown("""
         line-height: 1.4;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
 
-# Page setup
-st.set_page_config(layout="wide", page_title="Data Tool", page_icon="⚙️")
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Session state
 if "selected" not in st.session_state:
@@ -234,6 +392,27 @@ def get_system_status():
     }
     return status
 
+# Sidebar status rows only depend on the availability flags, so build them once per session
+if "system_status_html" not in st.session_state:
+    st.session_state.system_status_html = "".join(
+        f"""
+            <div style='margin: 0.3rem 0;'>
+                <span class='status-indicator status-{state}'></span>
+                <span style='font-size: 0.8rem; color: rgba(255,255,255,0.8);'>
+                    {system.title()}
+                </span>
+            </div>
+        """
+        for system, state in get_system_status().items()
+    )
+
+# Navigation buttons switch pages from an on_click callback, which runs before
+# the click's rerun, instead of calling st.rerun() and executing the script twice
+def _go_to(demo_page, selected=None):
+    if selected:
+        st.session_state.selected = selected
+    st.session_state.demo_page = demo_page
+
 # Sidebar navigation
 with st.sidebar:
     st.markdown("""
@@ -251,47 +430,17 @@ with st.sidebar:
         options=["Dashboard", "Data Tools", "Analytics", "System Config"],
         icons=["speedometer2", "arrow-repeat", "graph-up", "gear"],
         default_index=0,
-        styles={
-            "container": {"padding": "0px", "background-color": "transparent"},
-            "icon": {"color": "#3b82f6", "font-size": "16px"},
-            "nav-link": {
-                "font-size": "14px",
-                "text-align": "left",
-                "margin": "2px",
-                "padding": "8px 12px",
-                "background-color": "rgba(255,255,255,0.05)",
-                "border": "1px solid rgba(255,255,255,0.1)",
-                "border-radius": "6px",
-                "color": "white",
-                "--hover-color": "rgba(255,255,255,0.1)",
-            },
-            "nav-link-selected": {
-                "background": "linear-gradient(90deg, #3b82f6 0%, #2563eb 100%)",
-                "border": "1px solid #3b82f6",
-                "font-weight": "500"
-            },
-        },
+        styles=_MENU_STYLES,
     )
     st.session_state.selected = selected
 
     # System status in sidebar
     st.markdown("---")
     st.markdown("**System Status**")
-    status = get_system_status()
-    
-    for system, state in status.items():
-        status_class = f"status-{state}"
-        st.markdown(f"""
-            <div style='margin: 0.3rem 0;'>
-                <span class='status-indicator {status_class}'></span>
-                <span style='font-size: 0.8rem; color: rgba(255,255,255,0.8);'>
-                    {system.title()}
-                </span>
-            </div>
-        """, unsafe_allow_html=True)
+    st.markdown(st.session_state.system_status_html, unsafe_allow_html=True)
 
 # -------------------- DASHBOARD --------------------
-if selected == "Dashboard":
+def _render_dashboard():
     # Header
     st.markdown("""
         <div class='tool-header'>
@@ -301,51 +450,7 @@ if selected == "Dashboard":
     """, unsafe_allow_html=True)
 
     # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-            <div class='status-card'>
-                <div class='metric-large'>156</div>
-                <div class='metric-label'>Total Records</div>
-                <div class='progress-container'>
-                    <div class='progress-bar progress-success' style='width: 85%;'></div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-            <div class='status-card'>
-                <div class='metric-large'>142</div>
-                <div class='metric-label'>Processed</div>
-                <div class='progress-container'>
-                    <div class='progress-bar progress-success' style='width: 91%;'></div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-            <div class='status-card'>
-                <div class='metric-large'>11</div>
-                <div class='metric-label'>Warnings</div>
-                <div class='progress-container'>
-                    <div class='progress-bar progress-warning' style='width: 20%;'></div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown("""
-            <div class='status-card'>
-                <div class='metric-large'>3</div>
-                <div class='metric-label'>Errors</div>
-                <div class='progress-container'>
-                    <div class='progress-bar progress-error' style='width: 15%;'></div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+    st.markdown(_DASHBOARD_METRICS_HTML, unsafe_allow_html=True)
 
     # Migration modules
     st.markdown("### Available Migration Modules")
@@ -353,42 +458,21 @@ if selected == "Dashboard":
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Foundation Data", key="dash_foundation", use_container_width=True):
-            st.session_state.selected = "Data Tools"
-            st.session_state.demo_page = "foundation_data_view"
-            st.rerun()
+        st.button("Foundation Data", key="dash_foundation", use_container_width=True,
+                  on_click=_go_to, args=("foundation_data_view", "Data Tools"))
         
-        st.markdown(f"""
-            <div style='font-size: 0.8rem; color: rgba(255,255,255,0.7); margin-top: 0.5rem;'>
-                <span class='status-indicator status-{"online" if FOUNDATION_WRAPPER_AVAILABLE else "offline"}'></span>
-                {"Enhanced Processing Available" if FOUNDATION_WRAPPER_AVAILABLE else "Legacy System"}
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_MODULE_STATUS[FOUNDATION_WRAPPER_AVAILABLE], unsafe_allow_html=True)
         
-        if st.button("Employee Data", key="dash_employee", use_container_width=True):
-            st.session_state.selected = "Data Tools"
-            st.session_state.demo_page = "employee_data_management"
-            st.rerun()
+        st.button("Employee Data", key="dash_employee", use_container_width=True,
+                  on_click=_go_to, args=("employee_data_management", "Data Tools"))
             
-        st.markdown(f"""
-            <div style='font-size: 0.8rem; color: rgba(255,255,255,0.7); margin-top: 0.5rem;'>
-                <span class='status-indicator status-{"online" if EMPLOYEE_WRAPPER_AVAILABLE else "offline"}'></span>
-                {"Enhanced Processing Available" if EMPLOYEE_WRAPPER_AVAILABLE else "Legacy System"}
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_MODULE_STATUS[EMPLOYEE_WRAPPER_AVAILABLE], unsafe_allow_html=True)
     
     with col2:
-        if st.button("Payroll Data", key="dash_payroll", use_container_width=True):
-            st.session_state.selected = "Data Tools"
-            st.session_state.demo_page = "payroll_data_tool"
-            st.rerun()
+        st.button("Payroll Data", key="dash_payroll", use_container_width=True,
+                  on_click=_go_to, args=("payroll_data_tool", "Data Tools"))
             
-        st.markdown(f"""
-            <div style='font-size: 0.8rem; color: rgba(255,255,255,0.7); margin-top: 0.5rem;'>
-                <span class='status-indicator status-{"online" if PAYROLL_WRAPPER_AVAILABLE else "offline"}'></span>
-                {"Enhanced Processing Available" if PAYROLL_WRAPPER_AVAILABLE else "Legacy System"}
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_MODULE_STATUS[PAYROLL_WRAPPER_AVAILABLE], unsafe_allow_html=True)
         
         st.button("Time Data", key="dash_time", disabled=True, use_container_width=True)
         st.markdown("""
@@ -400,17 +484,16 @@ if selected == "Dashboard":
 
     # Recent activity
     st.markdown("### Recent Activity")
-    recent_data = [
-        {"Time": "14:32", "Module": "Foundation", "Action": "Data Validation", "Status": "✅ Complete"},
-        {"Time": "14:15", "Module": "Employee", "Action": "File Upload", "Status": "⚠️ Warning"},
-        {"Time": "13:45", "Module": "Payroll", "Action": "Mapping Rules", "Status": "🔄 Processing"},
-        {"Time": "13:22", "Module": "Foundation", "Action": "Export Data", "Status": "✅ Complete"},
-    ]
-    
-    st.dataframe(recent_data, use_container_width=True, hide_index=True)
+    st.markdown(_RECENT_ACTIVITY_TABLE)
 
 # -------------------- DATA TOOLS --------------------
-elif selected == "Data Tools":
+def _back_button(key):
+    """Render the back button shared by the individual tool pages"""
+    col1, _ = st.columns([1, 6])
+    with col1:
+        st.button("← Back", key=key, use_container_width=True, on_click=_go_to, args=("main",))
+
+def _render_data_tools():
     if st.session_state.demo_page == "main":
         st.markdown("""
             <div class='tool-header'>
@@ -424,59 +507,23 @@ elif selected == "Data Tools":
         
         with col1:
             # Foundation Data Card
-            st.markdown(f"""
-                <div class='module-card'>
-                    <div class='module-title'>Foundation Data</div>
-                    <div class='module-description'>
-                        {"Enhanced organizational hierarchy processing with HRP1000/HRP1001 support" if FOUNDATION_WRAPPER_AVAILABLE else "Organizational structure and hierarchy management"}
-                    </div>
-                    <div style='margin-top: 1rem; font-size: 0.8rem;'>
-                        <span class='status-indicator status-{"online" if FOUNDATION_WRAPPER_AVAILABLE else "offline"}'></span>
-                        {"Enhanced System" if FOUNDATION_WRAPPER_AVAILABLE else "Legacy System"}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(st.session_state.module_cards_html["foundation"], unsafe_allow_html=True)
             
-            if st.button("Open Foundation Data", key="found_btn", use_container_width=True):
-                st.session_state.demo_page = "foundation_data_view"
-                st.rerun()
+            st.button("Open Foundation Data", key="found_btn", use_container_width=True,
+                      on_click=_go_to, args=("foundation_data_view",))
             
             # Employee Data Card
-            st.markdown(f"""
-                <div class='module-card'>
-                    <div class='module-title'>Employee Data</div>
-                    <div class='module-description'>
-                        {"Complete employee information processing with PA0001/PA0002/PA0006/PA0105 files" if EMPLOYEE_WRAPPER_AVAILABLE else "Employee personal and job information management"}
-                    </div>
-                    <div style='margin-top: 1rem; font-size: 0.8rem;'>
-                        <span class='status-indicator status-{"online" if EMPLOYEE_WRAPPER_AVAILABLE else "offline"}'></span>
-                        {"Enhanced System" if EMPLOYEE_WRAPPER_AVAILABLE else "Legacy System"}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(st.session_state.module_cards_html["employee"], unsafe_allow_html=True)
             
-            if st.button("Open Employee Data", key="emp_btn", use_container_width=True):
-                st.session_state.demo_page = "employee_data_management"
-                st.rerun()
+            st.button("Open Employee Data", key="emp_btn", use_container_width=True,
+                      on_click=_go_to, args=("employee_data_management",))
         
         with col2:
             # Payroll Data Card
-            st.markdown(f"""
-                <div class='module-card'>
-                    <div class='module-title'>Payroll Data</div>
-                    <div class='module-description'>
-                        {"Advanced payroll processing with PA0008/PA0014 wage type validation" if PAYROLL_WRAPPER_AVAILABLE else "Payroll and compensation data management"}
-                    </div>
-                    <div style='margin-top: 1rem; font-size: 0.8rem;'>
-                        <span class='status-indicator status-{"online" if PAYROLL_WRAPPER_AVAILABLE else "offline"}'></span>
-                        {"Enhanced System" if PAYROLL_WRAPPER_AVAILABLE else "Legacy System"}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(st.session_state.module_cards_html["payroll"], unsafe_allow_html=True)
             
-            if st.button("Open Payroll Data", key="pay_btn", use_container_width=True):
-                st.session_state.demo_page = "payroll_data_tool"
-                st.rerun()
+            st.button("Open Payroll Data", key="pay_btn", use_container_width=True,
+                      on_click=_go_to, args=("payroll_data_tool",))
             
             # Time Data Card (disabled)
             st.markdown("""
@@ -494,17 +541,15 @@ elif selected == "Data Tools":
 
     # Individual tool pages
     elif st.session_state.demo_page == "foundation_data_view":
-        col1, col2 = st.columns([1, 6])
-        with col1:
-            if st.button("← Back", key="back_from_foundation", use_container_width=True):
-                st.session_state.demo_page = "main"
-                st.rerun()
-        
-        if FOUNDATION_WRAPPER_AVAILABLE:
+        _back_button("back_from_foundation")
+
+        render_foundation_data_management = _lazy("render_foundation_data_management") if FOUNDATION_WRAPPER_AVAILABLE else None
+        if render_foundation_data_management:
             render_foundation_data_management()
         else:
             try:
-                if 'OLD_FOUNDATION_AVAILABLE' in globals() and OLD_FOUNDATION_AVAILABLE:
+                render_foundation = _lazy("render_foundation") if OLD_FOUNDATION_AVAILABLE else None
+                if render_foundation:
                     st.markdown("### Foundation Data Processing")
                     render_foundation()
                 else:
@@ -513,37 +558,74 @@ elif selected == "Data Tools":
                 st.error("❌ Foundation system not available")
 
     elif st.session_state.demo_page == "employee_data_management":
-        col1, col2 = st.columns([1, 6])
-        with col1:
-            if st.button("← Back", key="back_from_employee", use_container_width=True):
-                st.session_state.demo_page = "main"
-                st.rerun()
+        _back_button("back_from_employee")
 
-        if EMPLOYEE_WRAPPER_AVAILABLE:
+        render_employee_data_management = _lazy("render_employee_data_management") if EMPLOYEE_WRAPPER_AVAILABLE else None
+        if render_employee_data_management:
             render_employee_data_management()
         else:
             st.error("❌ Employee Data Management system not available")
 
     elif st.session_state.demo_page == "payroll_data_tool":
-        col1, col2 = st.columns([1, 6])
-        with col1:
-            if st.button("← Back", key="back_from_payroll", use_container_width=True):
-                st.session_state.demo_page = "main"
-                st.rerun()
+        _back_button("back_from_payroll")
 
-        if PAYROLL_WRAPPER_AVAILABLE:
+        render_payroll_data_management = _lazy("render_payroll_data_management") if PAYROLL_WRAPPER_AVAILABLE else None
+        if render_payroll_data_management:
             render_payroll_data_management()
         else:
             try:
-                if 'OLD_PAYROLL_AVAILABLE' in globals() and OLD_PAYROLL_AVAILABLE:
-                    payroll_app.render_payroll_tool()
+                render_payroll_tool = _lazy("render_payroll_tool") if OLD_PAYROLL_AVAILABLE else None
+                if render_payroll_tool:
+                    render_payroll_tool()
                 else:
                     st.error("❌ Payroll system not available")
             except Exception as e:
                 st.error("❌ Payroll system not available")
 
 # -------------------- ANALYTICS --------------------
-elif selected == "Analytics":
+def _analytics_validation_report():
+    st.subheader("Validation Summary")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+            <div class='status-card'>
+                <div class='metric-large' style='color: #10b981;'>89%</div>
+                <div class='metric-label'>Validation Pass Rate</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+            <div class='status-card'>
+                <div class='metric-large' style='color: #f59e0b;'>47</div>
+                <div class='metric-label'>Items Requiring Attention</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown("""
+            <div class='status-card'>
+                <div class='metric-large' style='color: #3b82f6;'>2.3s</div>
+                <div class='metric-label'>Avg Processing Time</div>
+            </div>
+        """, unsafe_allow_html=True)
+
+def _analytics_data_quality():
+    st.subheader("Data Quality Metrics")
+    st.info("Data quality analysis tools coming soon")
+
+def _analytics_performance():
+    st.subheader("Performance Monitoring")
+    st.info("Performance monitoring dashboard coming soon")
+
+_ANALYTICS_VIEWS = {
+    "Validation Report": _analytics_validation_report,
+    "Data Quality": _analytics_data_quality,
+    "Performance": _analytics_performance,
+}
+
+def _render_analytics():
     st.markdown("""
         <div class='tool-header'>
             <h1 class='tool-title'>Data Analytics</h1>
@@ -551,47 +633,18 @@ elif selected == "Analytics":
         </div>
     """, unsafe_allow_html=True)
 
-    # Analytics tabs
-    tab1, tab2, tab3 = st.tabs(["Validation Report", "Data Quality", "Performance"])
-    
-    with tab1:
-        st.subheader("Validation Summary")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-                <div class='status-card'>
-                    <div class='metric-large' style='color: #10b981;'>89%</div>
-                    <div class='metric-label'>Validation Pass Rate</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-                <div class='status-card'>
-                    <div class='metric-large' style='color: #f59e0b;'>47</div>
-                    <div class='metric-label'>Items Requiring Attention</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-                <div class='status-card'>
-                    <div class='metric-large' style='color: #3b82f6;'>2.3s</div>
-                    <div class='metric-label'>Avg Processing Time</div>
-                </div>
-            """, unsafe_allow_html=True)
-    
-    with tab2:
-        st.subheader("Data Quality Metrics")
-        st.info("Data quality analysis tools coming soon")
-    
-    with tab3:
-        st.subheader("Performance Monitoring")
-        st.info("Performance monitoring dashboard coming soon")
+    # Analytics views; unlike st.tabs, only the selected view's body runs
+    view = st.radio(
+        "Analytics view",
+        list(_ANALYTICS_VIEWS),
+        horizontal=True,
+        key="analytics_tab",
+        label_visibility="collapsed",
+    )
+    _ANALYTICS_VIEWS[view]()
 
 # -------------------- SYSTEM CONFIG --------------------
-elif selected == "System Config":
+def _render_system_config():
     st.markdown("""
         <div class='tool-header'>
             <h1 class='tool-title'>System Configuration</h1>
@@ -605,13 +658,7 @@ elif selected == "System Config":
     with tab1:
         st.subheader("System Connections")
         
-        connections = [
-            {"System": "SAP HCM", "Status": "Connected", "Last Sync": "2 min ago"},
-            {"System": "SuccessFactors", "Status": "Connected", "Last Sync": "5 min ago"},
-            {"System": "S/4HANA", "Status": "Disconnected", "Last Sync": "Never"},
-        ]
-        
-        st.dataframe(connections, use_container_width=True, hide_index=True)
+        st.markdown(_CONNECTIONS_TABLE)
     
     with tab2:
         st.subheader("User Access Control")
@@ -620,3 +667,13 @@ elif selected == "System Config":
     with tab3:
         st.subheader("System Preferences")
         st.info("System settings interface coming soon")
+
+# Only the selected page's body runs on a rerun
+_PAGES = {
+    "Dashboard": _render_dashboard,
+    "Data Tools": _render_data_tools,
+    "Analytics": _render_analytics,
+    "System Config": _render_system_config,
+}
+
+_PAGES[selected]()
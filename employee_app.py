@@ -1,8 +1,16 @@
+import codecs
+import hashlib
+import importlib.util
 import streamlit as st
 import pandas as pd
-import chardet
-import numpy as np
-from io import StringIO, BytesIO
+try:
+    # C port of chardet with the same incremental detector API
+    from cchardet import UniversalDetector
+except ImportError:
+    from chardet.universaldetector import UniversalDetector
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import Dict, List, Optional, Tuple
 
 def init_employee_session_state():
@@ -10,6 +18,7 @@ def init_employee_session_state():
         'current_step': 'validation',
         'file_reviews': {},
         'cleansed_files': {},
+        'cleansed_columns': {},
         'target_data': None,
         'default_values': {
             'STATUS': 'Active', 'HR': 'NO_HR', 
@@ -28,36 +37,134 @@ def init_employee_session_state():
 # ✅ Call it immediately after defining
 init_employee_session_state()
 
-# Initialize session state
-if 'current_step' not in st.session_state:
-    st.session_state.current_step = 'validation'
-if 'file_reviews' not in st.session_state:
-    st.session_state.file_reviews = {}
-if 'cleansed_files' not in st.session_state:
-    st.session_state.cleansed_files = {}
-if 'target_data' not in st.session_state:
-    st.session_state.target_data = None
-if 'default_values' not in st.session_state:
-    st.session_state.default_values = {
-        'STATUS': 'Active', 'HR': 'NO_HR', 
-        'TIMEZONE': 'Australia/Melbourne', 'STATE': 'VIC',
-        'COUNTRY': 'Australia', 'REVIEW_FREQ': 'Annual'
-    }
-if 'gender_mapping' not in st.session_state:
-    st.session_state.gender_mapping = {'1': 'Male', '2': 'Female', 'Other': 'Others'}
-if 'manager_blank_action' not in st.session_state:
-    st.session_state.manager_blank_action = "Set to 'NO_MANAGER'"
-if 'manager_copy_field' not in st.session_state:
-    st.session_state.manager_copy_field = None
-if 'custom_transforms' not in st.session_state:
-    st.session_state.custom_transforms = {}
+# Optional faster Excel parser for full-file loads, probed without importing it;
+# pandas only knows the calamine engine from 2.2 on
+PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+EXCEL_ENGINE = 'calamine' if PANDAS_VERSION >= (2, 2) and importlib.util.find_spec('python_calamine') else None
+
+# Uploads validated side by side on the validation page
+VALIDATION_WORKERS = 4
+
+# Encoding detection reads at most this much of the file, in chunks
+ENCODING_SAMPLE_BYTES = 64 * 1024
+ENCODING_CHUNK_BYTES = 8 * 1024
+DECODE_CHUNK_BYTES = 1024 * 1024
+
+# Checked longest first: the UTF-32-LE BOM starts with the UTF-16-LE one
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """Cheap BOM / pure-ASCII check that lets common files skip chardet"""
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+    if head.isascii():
+        # ASCII is a subset of UTF-8, which also covers non-ASCII further into the file
+        return 'utf-8'
+    return None
+
+def detect_encoding(file) -> Optional[str]:
+    """Detect the file encoding from its head, stopping once chardet is confident"""
+    file.seek(0)
+    head = file.read(ENCODING_CHUNK_BYTES)
+    encoding = sniff_encoding(head)
+    if encoding:
+        file.seek(0)
+        return encoding
+
+    detector = UniversalDetector()
+    detector.feed(head)
+    bytes_read = len(head)
+    while bytes_read < ENCODING_SAMPLE_BYTES and not detector.done:
+        chunk = file.read(ENCODING_CHUNK_BYTES)
+        if not chunk:
+            break
+        detector.feed(chunk)
+        bytes_read += len(chunk)
+    detector.close()
+    file.seek(0)
+    return detector.result['encoding']
+
+def zero_byte_is_nul(encoding: str) -> bool:
+    """True for ASCII-compatible encodings, where every 0x00 byte decodes to NUL and nothing else does"""
+    return '\x00A'.encode(encoding) == b'\x00A'
+
+def count_null_chars(raw: bytes, encoding: str) -> int:
+    """Decode in chunks to surface encoding errors and count NULs without building the full str"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    view = memoryview(raw)
+    if zero_byte_is_nul(encoding):
+        # Decoding is only needed for its errors; the NULs are counted on the bytes
+        for start in range(0, len(view), DECODE_CHUNK_BYTES):
+            decoder.decode(view[start:start + DECODE_CHUNK_BYTES])
+        decoder.decode(b'', final=True)
+        return raw.count(b'\x00')
+    null_count = 0
+    for start in range(0, len(view), DECODE_CHUNK_BYTES):
+        null_count += decoder.decode(view[start:start + DECODE_CHUNK_BYTES]).count('\x00')
+    null_count += decoder.decode(b'', final=True).count('\x00')
+    return null_count
 
 def main():
     if st.session_state.current_step == 'validation':
         show_validation_page()
     elif st.session_state.current_step == 'mapping':
         show_mapping_page()
-def validate_file(file) -> Dict:
+
+def count_empty_cells(df: pd.DataFrame) -> int:
+    """Count missing cells with a single reduction over the boolean mask"""
+    return int(df.isna().to_numpy().sum())
+
+def empty_columns(df: pd.DataFrame) -> List[str]:
+    return df.columns[df.isna().all(axis=0)].tolist()
+
+def compute_stats(df: pd.DataFrame) -> Dict:
+    return {
+        'sample_data': df.head(),
+        'num_rows': len(df),
+        'num_columns': len(df.columns),
+        'empty_cells': count_empty_cells(df),
+        'duplicate_rows': df.duplicated().sum()
+    }
+
+def content_digest(raw: bytes) -> str:
+    """Short BLAKE2b digest used to key cached results on the uploaded bytes"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def strip_null_bytes(df: pd.DataFrame) -> pd.DataFrame:
+    """Removes NUL characters from text cells; cells that held nothing else become NaN"""
+    for col in df.select_dtypes(include='object').columns:
+        series = df[col]
+        # .str only works on columns holding text; skip e.g. parsed True/False/NaN columns
+        if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'mixed', 'mixed-integer'):
+            continue
+        has_null = series.str.contains('\x00', regex=False, na=False)
+        if has_null.any():
+            stripped = series[has_null].str.replace('\x00', '', regex=False)
+            df.loc[has_null, col] = stripped.mask(stripped == '')
+    return df
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcasts integer columns to the smallest width that holds their values"""
+    for col in df.columns:
+        # The join key stays as parsed so merge_data compares like with like
+        if col != 'Pers.No.' and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def validate_file(file, digest: str) -> Dict:
+    return validate_content(file.name, digest, file.getvalue())
+
+@st.cache_data(show_spinner=False)
+def validate_content(name: str, digest: str, _raw: bytes) -> Dict:
+    """Validate an upload; cached on name + digest so reruns and re-uploads skip the parse"""
+    file = BytesIO(_raw)
     result = {
         'status': 'ok',
         'message': '',
@@ -67,7 +174,7 @@ def validate_file(file) -> Dict:
         'recommendations': []
     }
 
-    if not file.name.lower().endswith(('.csv', '.xlsx')):
+    if not name.lower().endswith(('.csv', '.xlsx')):
         result.update({
             'status': 'error',
             'message': 'Invalid file type. Only CSV or Excel files accepted.',
@@ -78,7 +185,7 @@ def validate_file(file) -> Dict:
         })
         return result
 
-    if len(file.getvalue()) == 0:
+    if len(_raw) == 0:
         result.update({
             'status': 'error',
             'message': 'File is empty',
@@ -89,16 +196,10 @@ def validate_file(file) -> Dict:
         })
         return result
 
-    if file.name.endswith('.xlsx'):
+    if name.endswith('.xlsx'):
         try:
             df = pd.read_excel(file, nrows=5)
-            result['stats'] = {
-                'sample_data': df.head(),
-                'num_rows': len(df),
-                'num_columns': len(df.columns),
-                'empty_cells': df.isna().sum().sum(),
-                'duplicate_rows': df.duplicated().sum()
-            }
+            result['stats'] = compute_stats(df)
             return result
         except Exception as e:
             result.update({
@@ -112,24 +213,19 @@ def validate_file(file) -> Dict:
             return result
 
     try:
-        rawdata = file.getvalue()[:10000]
-        encoding = chardet.detect(rawdata)['encoding']
+        encoding = detect_encoding(file) or 'utf-8'
         result['encoding'] = encoding
 
-        content = file.getvalue().decode(encoding)
-        df = pd.read_csv(StringIO(content), nrows=100)
-        result['stats'] = {
-            'sample_data': df.head(),
-            'num_rows': len(df),
-            'num_columns': len(df.columns),
-            'empty_cells': df.isna().sum().sum(),
-            'duplicate_rows': df.duplicated().sum()
-        }
-
-        if content.count('\x00') > 0:
+        # Only the preview rows are parsed; pandas decodes them from the byte stream
+        df = pd.read_csv(file, nrows=100, encoding=encoding)
+        file.seek(0)
+        result['stats'] = compute_stats(df)
+
+        null_count = count_null_chars(_raw, encoding)
+        if null_count > 0:
             result['issues'].append({
                 'type': 'null_bytes',
-                'count': content.count('\x00'),
+                'count': null_count,
                 'severity': 'high'
             })
             result['recommendations'].append({
@@ -138,7 +234,7 @@ def validate_file(file) -> Dict:
                 'impact': 'Will replace null bytes with empty values'
             })
 
-        empty_cols = [col for col in df.columns if df[col].isna().all()]
+        empty_cols = empty_columns(df)
         if empty_cols:
             result['issues'].append({
                 'type': 'empty_columns',
@@ -219,79 +315,78 @@ def render_recommendations(filename: str, validation: Dict):
             cols = st.columns([3, 1])
             cols[0].write(recommendation['description'])
 
-            key = f"{filename}_{recommendation['action']}"
-            if key not in st.session_state.file_reviews[filename]['user_actions']:
-                st.session_state.file_reviews[filename]['user_actions'][key] = True
-
-            st.session_state.file_reviews[filename]['user_actions'][key] = cols[1].checkbox(
+            # user_actions is keyed by action name; the widget key only has to be unique
+            action = recommendation['action']
+            st.session_state.file_reviews[filename]['user_actions'][action] = cols[1].checkbox(
                 "Apply this fix",
                 value=True,
-                key=key,
+                key=f"{filename}_{action}",
                 help=recommendation.get('impact', '')
             )
 
             if 'impact' in recommendation:
                 st.caption(f"Impact: {recommendation['impact']}")
 
-def load_clean_file(file, validation) -> pd.DataFrame:
-    if file.name.endswith('.xlsx'):
-        return pd.read_excel(file)
-    content = file.getvalue().decode(validation['encoding'])
-    return pd.read_csv(StringIO(content))
+def load_clean_file(file, review) -> pd.DataFrame:
+    validation = review['validation']
+    return load_clean_content(file.name, review['content_hash'], validation['encoding'], file.getvalue())
+
+@st.cache_data(show_spinner=False)
+def load_clean_content(name: str, digest: str, encoding: Optional[str], _raw: bytes) -> pd.DataFrame:
+    """Full parse of a file that passed validation, cached like validate_content"""
+    if name.endswith('.xlsx'):
+        return optimize_dtypes(pd.read_excel(BytesIO(_raw), engine=EXCEL_ENGINE))
+    return optimize_dtypes(pd.read_csv(BytesIO(_raw), encoding=encoding))
 
 def apply_user_actions(file, review) -> Tuple[pd.DataFrame, Dict]:
     validation = review['validation']
-    actions = review['user_actions']
+    actions = tuple(action for action, should_apply in review['user_actions'].items() if should_apply)
+    try:
+        df, applied_actions, new_stats = apply_actions_content(
+            review['content_hash'], validation['encoding'], actions, file.getvalue()
+        )
+    except Exception as e:
+        st.error(f"Error during cleansing: {str(e)}")
+        raise
+
     report = {
         'original_stats': validation['stats'],
-        'applied_actions': [],
-        'new_stats': None
+        'applied_actions': applied_actions,
+        'new_stats': new_stats
     }
-
-    try:
-        if any('fix_encoding' in key for key in actions if actions[key]):
-            file.seek(0)
-            for encoding in ['utf-8', 'latin-1', 'windows-1252', 'iso-8859-1']:
-                try:
-                    content = file.getvalue().decode(encoding)
-                    df = pd.read_csv(StringIO(content))
-                    report['applied_actions'].append(f"Applied encoding: {encoding}")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Failed to decode with any supported encoding")
-        else:
-            content = file.getvalue().decode(validation['encoding'])
-            df = pd.read_csv(StringIO(content))
-
-        for action_key, should_apply in actions.items():
-            if not should_apply:
+    return df, report
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def apply_actions_content(digest: str, encoding: Optional[str], actions: Tuple[str, ...],
+                          _raw: bytes) -> Tuple[pd.DataFrame, List[str], Dict]:
+    """Parse and cleanse an upload; cached on digest + chosen actions so repeat applies skip the work"""
+    applied_actions = []
+    if 'fix_encoding' in actions:
+        for encoding in ['utf-8', 'latin-1', 'windows-1252', 'iso-8859-1']:
+            try:
+                df = pd.read_csv(BytesIO(_raw), encoding=encoding)
+                applied_actions.append(f"Applied encoding: {encoding}")
+                break
+            except UnicodeDecodeError:
                 continue
+        else:
+            raise ValueError("Failed to decode with any supported encoding")
+    else:
+        df = pd.read_csv(BytesIO(_raw), encoding=encoding)
 
-            if 'remove_null_bytes' in action_key:
-                df = df.replace('\x00', np.nan)
-                report['applied_actions'].append("Removed null bytes")
-
-            if 'drop_empty_columns' in action_key:
-                empty_cols = [col for col in df.columns if df[col].isna().all()]
-                if empty_cols:
-                    df = df.drop(columns=empty_cols)
-                    report['applied_actions'].append(f"Dropped empty columns: {', '.join(empty_cols)}")
+    for action in actions:
+        if action == 'remove_null_bytes':
+            df = strip_null_bytes(df)
+            applied_actions.append("Removed null bytes")
 
-        report['new_stats'] = {
-            'sample_data': df.head(),
-            'num_rows': len(df),
-            'num_columns': len(df.columns),
-            'empty_cells': df.isna().sum().sum(),
-            'duplicate_rows': df.duplicated().sum()
-        }
+        if action == 'drop_empty_columns':
+            empty_cols = empty_columns(df)
+            if empty_cols:
+                df = df.drop(columns=empty_cols)
+                applied_actions.append(f"Dropped empty columns: {', '.join(empty_cols)}")
 
-        return df, report
-
-    except Exception as e:
-        st.error(f"Error during cleansing: {str(e)}")
-        raise
+    df = optimize_dtypes(df)
+    return df, applied_actions, compute_stats(df)
 
 def show_cleansing_report(filename: str, report: Dict):
     with st.expander(f"🧹 Cleansing Report for {filename}", expanded=True):
@@ -329,16 +424,17 @@ def merge_data() -> pd.DataFrame:
     pa0006 = st.session_state.cleansed_files.get('PA0006')
     pa0105 = st.session_state.cleansed_files.get('PA0105')
 
-    if not all([pa0002, pa0001, pa0006, pa0105]):
+    if any(df is None for df in (pa0002, pa0001, pa0006, pa0105)):
         raise ValueError("Missing required source files")
 
-    return pa0002.merge(
-        pa0001, on='Pers.No.', how='left'
-    ).merge(
-        pa0006, on='Pers.No.', how='left'
-    ).merge(
-        pa0105, on='Pers.No.', how='left'
+    # Sorted key indexes let pandas take its monotonic merge-join path
+    # instead of hashing 'Pers.No.' again for every join
+    merged, *others = (
+        df.set_index('Pers.No.').sort_index() for df in (pa0002, pa0001, pa0006, pa0105)
     )
+    for other in others:
+        merged = merged.merge(other, left_index=True, right_index=True, how='left')
+    return merged.reset_index()
 
 def show_validation_page():
     st.title("Data Validation")
@@ -347,10 +443,23 @@ def show_validation_page():
                                        accept_multiple_files=True)
     if uploaded_files:
         for file in uploaded_files:
-            if file.name not in st.session_state.file_reviews:
+            review = st.session_state.file_reviews.get(file.name)
+            # The content is hashed once per upload; reruns over the same upload reuse the stored digest
+            if review is not None and review.get('file_id') == file.file_id:
+                continue
+            digest = content_digest(file.getvalue())
+            # A re-upload under the same name with new content starts its review over
+            if review is None or review.get('content_hash') != digest:
                 st.session_state.file_reviews[file.name] = {
-                    'validation': None, 'user_actions': {}, 'processed': False
+                    'validation': None, 'user_actions': {}, 'processed': False,
+                    'content_hash': digest, 'file_id': file.file_id
                 }
+                st.session_state.cleansed_files.pop(file.name, None)
+                st.session_state.cleansed_columns.pop(file.name, None)
+            else:
+                review['file_id'] = file.file_id
+        validate_pending(uploaded_files)
+        for file in uploaded_files:
             with st.expander(f"File: {file.name}"):
                 file_review_workflow(file)
 
@@ -360,11 +469,31 @@ def show_validation_page():
                 st.session_state.current_step = 'mapping'
                 st.rerun()
 
+def store_cleansed(name: str, df: pd.DataFrame):
+    """Keeps a cleansed frame in session along with its column names for the mapping widgets"""
+    st.session_state.cleansed_files[name] = df
+    st.session_state.cleansed_columns[name] = tuple(df.columns)
+
+def validate_pending(uploaded_files):
+    """Validates every not-yet-validated upload concurrently, before the per-file expanders render"""
+    reviews = st.session_state.file_reviews
+    pending = [f for f in uploaded_files if reviews[f.name]['validation'] is None]
+    if len(pending) < 2:
+        return
+    # Workers share this run's context so the cached validation behaves as on the script thread
+    ctx = get_script_run_ctx()
+    with st.spinner(f"Validating {len(pending)} files..."):
+        with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS, initializer=add_script_run_ctx,
+                                initargs=(None, ctx)) as executor:
+            digests = [reviews[f.name]['content_hash'] for f in pending]
+            for file, validation in zip(pending, executor.map(validate_file, pending, digests)):
+                reviews[file.name]['validation'] = validation
+
 def file_review_workflow(file):
     review = st.session_state.file_reviews[file.name]
     if review['validation'] is None:
         with st.spinner(f"Validating {file.name}..."):
-            review['validation'] = validate_file(file)
+            review['validation'] = validate_file(file, review['content_hash'])
 
     validation = review['validation']
     if validation['status'] == 'error':
@@ -373,7 +502,7 @@ def file_review_workflow(file):
         st.warning(validation['message'])
     else:
         st.success("File valid")
-        st.session_state.cleansed_files[file.name] = load_clean_file(file, validation)
+        store_cleansed(file.name, load_clean_file(file, review))
         review['processed'] = True
         return
 
@@ -387,9 +516,10 @@ def file_review_workflow(file):
     if review['user_actions'] and st.button(f"Apply to {file.name}"):
         with st.spinner("Processing..."):
             cleansed_df, report = apply_user_actions(file, review)
-            st.session_state.cleansed_files[file.name] = cleansed_df
+            store_cleansed(file.name, cleansed_df)
             review['processed'] = True
             show_cleansing_report(file.name, report)
+
 def show_mapping_page():
     st.title("Data Mapping")
 
@@ -429,7 +559,7 @@ def show_mapping_page():
     if st.session_state.manager_blank_action == "Copy from another field":
         st.session_state.manager_copy_field = st.selectbox(
             "Select field to copy from", 
-            options=st.session_state.cleansed_files['PA0001'].columns.tolist()
+            options=st.session_state.cleansed_columns['PA0001']
         )
 
     st.subheader("Gender Mapping")
@@ -1,32 +1,90 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import os
 import json
+import tempfile
+import csv
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
 import io
-from datetime import datetime
 import hashlib
+import hmac
+import importlib.metadata
+import importlib.util
+
+# Streamlit's secrets errors: newer releases raise StreamlitSecretNotFoundError for a missing or
+# unparsable secrets.toml, older ones a plain FileNotFoundError or toml's decode error
+import toml
+try:
+    from streamlit.errors import StreamlitSecretNotFoundError
+except ImportError:
+    StreamlitSecretNotFoundError = FileNotFoundError
+SECRETS_UNAVAILABLE_ERRORS = (StreamlitSecretNotFoundError, FileNotFoundError, toml.TomlDecodeError)
+
+# Optional: C JSON codec for config files
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration directories
 CONFIG_DIR = "employee_configs"
 PICKLIST_DIR = "employee_picklists"
 SOURCE_SAMPLES_DIR = "employee_source_samples"
 MAX_SAMPLE_ROWS = 1000
+PA_FILES = ['PA0001', 'PA0002', 'PA0006', 'PA0105']
+TEMPLATE_COLUMNS = ['target_column', 'display_name', 'description']
+REQUIRED_TEMPLATE_FIELDS = (('target_column', 'Field Code'), ('display_name', 'Display Name'))
+
+# Rust-backed Excel reader when python-calamine is installed (pandas knows it from 2.2 on)
+# Versions are read from package metadata so pandas is not imported until a panel needs it
+PANDAS_VERSION = tuple(int(part) for part in importlib.metadata.version('pandas').split('.')[:2])
+EXCEL_ENGINE = 'calamine' if PANDAS_VERSION >= (2, 2) and importlib.util.find_spec('python_calamine') else None
+
+# Built once at import; only get_default_employee_template hands out mutable copies
+TRANSFORMATION_OPTIONS = {
+    "None": "Use data as-is",
+    "Title Case": "Proper capitalization (John Smith)",
+    "UPPERCASE": "All capital letters (JOHN SMITH)",
+    "lowercase": "All small letters (john smith)",
+    "Trim Whitespace": "Remove extra spaces",
+    "Date Format (YYYY-MM-DD)": "Convert dates to standard format",
+    "Combine First + Last Name": "Join first and last names together",
+    "Employee ID Format": "Format employee IDs consistently"
+}
+
+DEFAULT_EMPLOYEE_TEMPLATE = (
+    {"target_column": "USERID", "display_name": "Employee ID", "description": "Unique identifier for each employee"},
+    {"target_column": "USERNAME", "display_name": "Display Name", "description": "Name shown in the system"},
+    {"target_column": "FIRSTNAME", "display_name": "First Name", "description": "Employee's first name"},
+    {"target_column": "LASTNAME", "display_name": "Last Name", "description": "Employee's last name"},
+    {"target_column": "EMAIL", "display_name": "Email Address", "description": "Employee's email"},
+    {"target_column": "DEPARTMENT", "display_name": "Department", "description": "Which department the employee works in"},
+    {"target_column": "HIREDATE", "display_name": "Hire Date", "description": "When the employee started"},
+    {"target_column": "STATUS", "display_name": "Employment Status", "description": "Active, Inactive, etc."},
+    {"target_column": "BIZ_PHONE", "display_name": "Work Phone", "description": "Business phone number"},
+    {"target_column": "MANAGER", "display_name": "Manager", "description": "Employee's supervisor"}
+)
 
-def initialize_directories() -> None:
-    """Create required directories if they don't exist"""
+@functools.lru_cache(maxsize=1)
+def initialize_directories() -> bool:
+    """Create required directories if they don't exist; later calls in this process are no-ops"""
     for directory in [CONFIG_DIR, PICKLIST_DIR, SOURCE_SAMPLES_DIR]:
         Path(directory).mkdir(exist_ok=True)
+    return True
+
+@st.cache_data(show_spinner=False)
+def read_sample_columns(sample_path: str, mtime: float) -> List[str]:
+    """Header of a saved sample as pandas names it for the PA data, cached until the file changes"""
+    import pandas as pd
+    return pd.read_csv(sample_path, nrows=0).columns.tolist()
 
 def get_employee_source_columns(source_file: str) -> List[str]:
     """Get available columns from employee source files"""
     try:
         sample_path = os.path.join(SOURCE_SAMPLES_DIR, f"{source_file}_sample.csv")
         if os.path.exists(sample_path):
-            df = pd.read_csv(sample_path, nrows=1)
-            return df.columns.tolist()
+            return read_sample_columns(sample_path, os.path.getmtime(sample_path))
     except Exception as e:
         st.error(f"Error loading source columns: {str(e)}")
     
@@ -48,6 +106,18 @@ def get_employee_source_columns(source_file: str) -> List[str]:
     
     return standard_columns.get(source_file, [])
 
+def count_sample_files() -> int:
+    """How many PA sample files are saved, from one directory listing instead of a stat per file"""
+    if not os.path.isdir(SOURCE_SAMPLES_DIR):
+        return 0
+    with os.scandir(SOURCE_SAMPLES_DIR) as entries:
+        present = {entry.name for entry in entries}
+    return sum(f"{pa_file}_sample.csv" in present for pa_file in PA_FILES)
+
+def get_employee_mappings() -> Optional[List[Dict]]:
+    """Saved field mappings from session state; 'employee_mapping_config' is the only key holding them"""
+    return st.session_state.get('employee_mapping_config')
+
 def save_config_with_session_state(config_type: str, config_data: Union[Dict, List]) -> None:
     """Save configuration to both file and session state"""
     
@@ -56,15 +126,8 @@ def save_config_with_session_state(config_type: str, config_data: Union[Dict, Li
     
     # Also save to session state for immediate access
     if config_type == "employee_column_mappings":
-        if isinstance(config_data, list):
-            mapping_df = pd.DataFrame(config_data)
-        else:
-            mapping_df = config_data
-            
-        # Save to multiple session state keys for compatibility
-        st.session_state['employee_mapping_config'] = mapping_df
-        st.session_state['employee_current_mappings'] = mapping_df
-        st.session_state['employee_admin_mappings'] = mapping_df
+        # Kept as the saved list of dicts; readers that need a DataFrame build one
+        st.session_state['employee_mapping_config'] = config_data
         
         st.success("✅ Employee configuration saved and ready to use!")
         
@@ -77,24 +140,44 @@ def load_config_with_session_state(config_type: str) -> Optional[Union[Dict, Lis
     
     if config_type == "employee_column_mappings":
         # Check session state first
-        if 'employee_mapping_config' in st.session_state:
-            config_data = st.session_state['employee_mapping_config']
-            if isinstance(config_data, pd.DataFrame):
-                return config_data.to_dict('records')
-            return config_data
+        mappings = get_employee_mappings()
+        if mappings is not None:
+            return mappings
     
     # Fall back to file-based loading
     return load_config(config_type)
 
+def encode_config(config_data: Union[Dict, List]) -> bytes:
+    """Serialize a config as indented JSON, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(config_data, indent=2).encode("utf-8")
+
 def save_config(config_type: str, config_data: Union[Dict, List]) -> None:
     """Save configuration to file"""
     try:
         config_path = f"{CONFIG_DIR}/{config_type}_config.json"
-        with open(config_path, "w") as f:
-            json.dump(config_data, f, indent=2)
+        data = encode_config(config_data)
+        # Write a uniquely named file beside the target and swap it in, so readers never see a
+        # half-written file and concurrent sessions never share a temp file
+        fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=f"{config_type}_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, config_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        read_config_file.clear()
     except Exception as e:
         st.error(f"Error saving config: {str(e)}")
 
+@st.cache_data(show_spinner=False)
+def read_config_file(config_path: str, mtime: float) -> Union[Dict, List]:
+    """Parsed JSON config, cached until the file changes"""
+    data = Path(config_path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 def load_config(config_type: str) -> Optional[Union[Dict, List]]:
     """Load configuration from file"""
     try:
@@ -102,40 +185,36 @@ def load_config(config_type: str) -> Optional[Union[Dict, List]]:
         if not os.path.exists(config_path):
             return None
             
-        with open(config_path, "r") as f:
-            data = json.load(f)
-            return data
+        return read_config_file(config_path, os.path.getmtime(config_path))
     except Exception as e:
         st.error(f"Error loading config: {str(e)}")
         return None
 
 def get_simple_transformation_options():
     """Get simple transformation options for non-technical users"""
-    return {
-        "None": "Use data as-is",
-        "Title Case": "Proper capitalization (John Smith)",
-        "UPPERCASE": "All capital letters (JOHN SMITH)",
-        "lowercase": "All small letters (john smith)",
-        "Trim Whitespace": "Remove extra spaces",
-        "Date Format (YYYY-MM-DD)": "Convert dates to standard format",
-        "Combine First + Last Name": "Join first and last names together",
-        "Employee ID Format": "Format employee IDs consistently"
-    }
+    return TRANSFORMATION_OPTIONS
 
 def get_default_employee_template():
-    """Get the standard employee data template"""
-    return [
-        {"target_column": "USERID", "display_name": "Employee ID", "description": "Unique identifier for each employee"},
-        {"target_column": "USERNAME", "display_name": "Display Name", "description": "Name shown in the system"},
-        {"target_column": "FIRSTNAME", "display_name": "First Name", "description": "Employee's first name"},
-        {"target_column": "LASTNAME", "display_name": "Last Name", "description": "Employee's last name"},
-        {"target_column": "EMAIL", "display_name": "Email Address", "description": "Employee's email"},
-        {"target_column": "DEPARTMENT", "display_name": "Department", "description": "Which department the employee works in"},
-        {"target_column": "HIREDATE", "display_name": "Hire Date", "description": "When the employee started"},
-        {"target_column": "STATUS", "display_name": "Employment Status", "description": "Active, Inactive, etc."},
-        {"target_column": "BIZ_PHONE", "display_name": "Work Phone", "description": "Business phone number"},
-        {"target_column": "MANAGER", "display_name": "Manager", "description": "Employee's supervisor"}
-    ]
+    """Get a fresh, editable copy of the standard employee data template"""
+    return [dict(field) for field in DEFAULT_EMPLOYEE_TEMPLATE]
+
+def get_admin_password_hash() -> Optional[bytes]:
+    """SHA-256 of the admin password, preferring a pre-hashed secret over a plaintext one; None if the stored hash is invalid"""
+    try:
+        stored_hash = st.secrets.get("employee_admin_password_sha256")
+        password = st.secrets.get("employee_admin_password", "admin123")
+    except SECRETS_UNAVAILABLE_ERRORS:
+        # No usable secrets file: missing, or malformed and so treated as missing
+        stored_hash = None
+        password = "admin123"
+    
+    if stored_hash:
+        try:
+            password_hash = bytes.fromhex(stored_hash)
+        except (TypeError, ValueError):
+            return None
+        return password_hash if len(password_hash) == hashlib.sha256().digest_size else None
+    return hashlib.sha256(password.encode("utf-8")).digest()
 
 def check_admin_password() -> bool:
     """Check if admin password is correct"""
@@ -147,11 +226,11 @@ def check_admin_password() -> bool:
     if st.session_state.employee_admin_authenticated:
         return True
     
-    # Get password from secrets or use default
-    try:
-        correct_password = st.secrets.get("employee_admin_password", "admin123")
-    except:
-        correct_password = "admin123"  # Fallback if secrets not available
+    # Get password hash from secrets or use default
+    password_hash = get_admin_password_hash()
+    if password_hash is None:
+        st.error("❌ Admin access is disabled: employee_admin_password_sha256 in secrets is not a valid SHA-256 hex digest")
+        return False
     
     # Show password input
     st.markdown("""
@@ -176,7 +255,8 @@ def check_admin_password() -> bool:
     
     with col1:
         if st.button("🔓 **Access Admin**", type="primary"):
-            if password_input == correct_password:
+            input_hash = hashlib.sha256(password_input.encode("utf-8")).digest()
+            if hmac.compare_digest(input_hash, password_hash):
                 st.session_state.employee_admin_authenticated = True
                 st.success("✅ Access granted! Refreshing...")
                 st.rerun()
@@ -204,7 +284,7 @@ def check_admin_password() -> bool:
     - Protects configuration integrity
     
     **For Administrators:**
-    - Password can be configured in Streamlit secrets as `employee_admin_password`
+    - Password can be configured in Streamlit secrets as `employee_admin_password_sha256` (hex SHA-256) or `employee_admin_password`
     - Use a strong password in production environments
     - Regularly review who has admin access
     """)
@@ -254,11 +334,7 @@ def show_configuration_status():
     
     with col3:
         # Check if sample files exist
-        sample_files = 0
-        for pa_file in ['PA0001', 'PA0002', 'PA0006', 'PA0105']:
-            sample_path = os.path.join(SOURCE_SAMPLES_DIR, f"{pa_file}_sample.csv")
-            if os.path.exists(sample_path):
-                sample_files += 1
+        sample_files = count_sample_files()
         
         if sample_files > 0:
             st.success(f"✅ **Sample Files**")
@@ -277,6 +353,7 @@ def show_configuration_status():
 
 def upload_sample_files():
     """Handle sample file uploads with simple explanations"""
+    import pandas as pd
     st.subheader("📂 Upload Sample Files")
     st.info("**What this does:** Upload small samples of your PA files so we can see what data fields are available")
     
@@ -309,50 +386,49 @@ def upload_sample_files():
     
     if uploaded_file:
         try:
-            # Read the file
+            # Read and save the sample
+            sample_path = os.path.join(SOURCE_SAMPLES_DIR, f"{pa_code}_sample.csv")
+            # Parse only the sample rows, so quoted multi-line fields stay whole and the upload's encoding is honoured
             if uploaded_file.name.endswith('.csv'):
                 df = pd.read_csv(uploaded_file, nrows=MAX_SAMPLE_ROWS)
             else:
-                df = pd.read_excel(uploaded_file, nrows=MAX_SAMPLE_ROWS)
-            
-            # Save sample
-            sample_path = os.path.join(SOURCE_SAMPLES_DIR, f"{pa_code}_sample.csv")
+                df = pd.read_excel(uploaded_file, nrows=MAX_SAMPLE_ROWS, engine=EXCEL_ENGINE)
             df.to_csv(sample_path, index=False)
+            preview = df.head(3)
+            total_records, columns = len(df), df.columns.tolist()
             
             st.success(f"✅ **{pa_code} sample uploaded successfully!**")
             
             # Show preview
             st.subheader("📋 File Preview")
-            st.dataframe(df.head(3), use_container_width=True)
+            st.dataframe(preview, use_container_width=True)
             
             # Show field information
             st.subheader("📊 Available Fields")
-            st.write(f"**Total Records:** {len(df):,}")
-            st.write(f"**Available Fields:** {len(df.columns)}")
+            st.write(f"**Total Records:** {total_records:,}")
+            st.write(f"**Available Fields:** {len(columns)}")
             
-            # Show columns in a neat way
-            col_chunks = [df.columns[i:i+3] for i in range(0, len(df.columns), 3)]
-            for chunk in col_chunks:
-                cols = st.columns(3)
-                for i, col_name in enumerate(chunk):
-                    with cols[i]:
-                        st.write(f"• {col_name}")
+            # Show columns in a neat way, as one element rather than a row of widgets per three fields
+            st.dataframe({"Field": columns}, use_container_width=True, hide_index=True)
             
         except Exception as e:
             st.error(f"❌ Error reading file: {str(e)}")
             st.info("**Tips:** Make sure your file is a valid CSV or Excel file with employee data")
 
+def commit_template_edits(fields: List[Dict]) -> None:
+    """Make the given rows the template being edited and drop the editor's pending edits"""
+    st.session_state["employee_template_edit"] = fields
+    st.session_state.pop("employee_template_editor", None)
+
 def configure_employee_template():
     """Configure the employee data template with simple interface"""
+    import pandas as pd
     st.subheader("🎯 Employee Data Template")
     st.info("**What this does:** Define what fields you want in your final employee file (emp.csv)")
     
-    # Load current template or use default
-    current_template = load_config("employee_template") or get_default_employee_template()
-    
-    # Initialize session state
+    # Initialize session state from the current template or the default
     if "employee_template_edit" not in st.session_state:
-        st.session_state["employee_template_edit"] = current_template.copy()
+        st.session_state["employee_template_edit"] = load_config("employee_template") or get_default_employee_template()
     
     st.markdown("**Instructions:** These are the fields that will appear in your final employee file. You can add, remove, or reorder them.")
     
@@ -362,48 +438,39 @@ def configure_employee_template():
         st.write("**Current Employee Fields:**")
     with col2:
         if st.button("🔄 Reset to Default", help="Restore the standard employee fields"):
-            st.session_state["employee_template_edit"] = get_default_employee_template()
+            commit_template_edits(get_default_employee_template())
             st.rerun()
     
-    # Show current fields in a simple table
-    if st.session_state["employee_template_edit"]:
-        for i, field in enumerate(st.session_state["employee_template_edit"]):
-            cols = st.columns([3, 3, 3, 1, 1])
-            
-            with cols[0]:
-                field['target_column'] = st.text_input(
-                    "Field Code",
-                    value=field['target_column'],
-                    key=f"field_code_{i}",
-                    help="Technical name (e.g., USERID, FIRSTNAME)"
-                )
-            
-            with cols[1]:
-                field['display_name'] = st.text_input(
-                    "Display Name", 
-                    value=field['display_name'],
-                    key=f"field_name_{i}",
-                    help="Human-readable name (e.g., Employee ID, First Name)"
-                )
-            
-            with cols[2]:
-                field['description'] = st.text_input(
-                    "Description",
-                    value=field.get('description', ''),
-                    key=f"field_desc_{i}",
-                    help="What this field contains"
-                )
-            
-            with cols[3]:
-                if st.button("⬆️", key=f"up_{i}", disabled=(i == 0), help="Move up"):
-                    st.session_state["employee_template_edit"][i], st.session_state["employee_template_edit"][i-1] = \
-                        st.session_state["employee_template_edit"][i-1], st.session_state["employee_template_edit"][i]
-                    st.rerun()
-            
-            with cols[4]:
-                if st.button("🗑️", key=f"del_{i}", help="Delete field"):
-                    del st.session_state["employee_template_edit"][i]
-                    st.rerun()
+    # Show current fields in one editable table; rows can be edited, added and deleted in place
+    template_df = pd.DataFrame(st.session_state["employee_template_edit"], columns=TEMPLATE_COLUMNS)
+    edited_df = st.data_editor(
+        template_df,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key="employee_template_editor",
+        column_config={
+            "target_column": st.column_config.TextColumn("Field Code", help="Technical name (e.g., USERID, FIRSTNAME)"),
+            "display_name": st.column_config.TextColumn("Display Name", help="Human-readable name (e.g., Employee ID, First Name)"),
+            "description": st.column_config.TextColumn("Description", help="What this field contains")
+        }
+    )
+    fields = edited_df.fillna("").to_dict('records')
+    
+    # Reorder fields
+    if len(fields) > 1:
+        move_cols = st.columns([3, 1])
+        with move_cols[0]:
+            move_index = st.selectbox(
+                "Move field up",
+                range(1, len(fields)),
+                format_func=lambda i: f"{fields[i]['target_column']} ({fields[i]['display_name']})"
+            )
+        with move_cols[1]:
+            if st.button("⬆️ Move Up", help="Move the selected field one place up"):
+                fields[move_index - 1], fields[move_index] = fields[move_index], fields[move_index - 1]
+                commit_template_edits(fields)
+                st.rerun()
     
     # Add new field
     st.markdown("### ➕ Add New Field")
@@ -418,11 +485,12 @@ def configure_employee_template():
     with new_cols[3]:
         if st.button("➕ Add", help="Add this field to the template"):
             if new_code and new_name:
-                st.session_state["employee_template_edit"].append({
+                fields.append({
                     "target_column": new_code,
                     "display_name": new_name,
                     "description": new_desc
                 })
+                commit_template_edits(fields)
                 st.success(f"Added {new_name}")
                 st.rerun()
             else:
@@ -431,24 +499,28 @@ def configure_employee_template():
     # Save template
     if st.button("💾 Save Employee Template", type="primary"):
         # Validate
-        errors = []
-        for i, field in enumerate(st.session_state["employee_template_edit"]):
-            if not field.get('target_column'):
-                errors.append(f"Field {i+1}: Missing Field Code")
-            if not field.get('display_name'):
-                errors.append(f"Field {i+1}: Missing Display Name")
+        errors = [
+            f"Field {i+1}: Missing {label}"
+            for i, field in enumerate(fields)
+            for key, label in REQUIRED_TEMPLATE_FIELDS
+            if not field.get(key)
+        ]
         
         if errors:
             st.error("**Please fix these issues:**")
             for error in errors:
                 st.write(f"• {error}")
         else:
-            save_config_with_session_state("employee_template", st.session_state["employee_template_edit"])
+            save_config_with_session_state("employee_template", fields)
+            commit_template_edits(fields)
             
             # Show preview of saved template
             st.subheader("✅ Saved Template Preview")
-            template_df = pd.DataFrame(st.session_state["employee_template_edit"])
-            st.dataframe(template_df[['target_column', 'display_name', 'description']], use_container_width=True)
+            st.dataframe(
+                fields,
+                column_order=TEMPLATE_COLUMNS,
+                use_container_width=True
+            )
 
 def configure_field_mappings():
     """Configure field mappings with simple explanations"""
@@ -472,11 +544,14 @@ def configure_field_mappings():
             })
         
         if mapping_summary:
-            mapping_df = pd.DataFrame(mapping_summary)
-            st.dataframe(mapping_df, use_container_width=True)
+            st.dataframe(mapping_summary, use_container_width=True)
             
             # Download current mappings
-            csv_data = mapping_df.to_csv(index=False)
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(mapping_summary[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(mapping_summary)
+            csv_data = buffer.getvalue()
             st.download_button(
                 "📥 Download Current Mappings",
                 data=csv_data,
@@ -492,7 +567,7 @@ def configure_field_mappings():
     
     with cols[0]:
         # Target field selection
-        template = load_config("employee_template") or get_default_employee_template()
+        template = load_config("employee_template") or DEFAULT_EMPLOYEE_TEMPLATE
         target_options = [f"{field['target_column']} ({field['display_name']})" for field in template]
         
         if target_options:
@@ -577,14 +652,15 @@ def configure_field_mappings():
         mapping_options = [f"{m.get('target_column', '')} ← {m.get('source_file', '')}:{m.get('source_column', '')}" 
                           for m in current_mappings]
         
-        selected_to_delete = st.selectbox(
+        # Options are positions in current_mappings, so the choice is the index to delete
+        index_to_delete = st.selectbox(
             "Select mapping to delete:",
-            [""] + mapping_options
+            [None] + list(range(len(mapping_options))),
+            format_func=lambda i: "" if i is None else mapping_options[i]
         )
         
-        if selected_to_delete and st.button("🗑️ Delete Selected Mapping"):
-            # Find and remove the selected mapping
-            index_to_delete = mapping_options.index(selected_to_delete)
+        if index_to_delete is not None and st.button("🗑️ Delete Selected Mapping"):
+            # Remove the selected mapping
             del current_mappings[index_to_delete]
             save_config_with_session_state("employee_column_mappings", current_mappings)
             st.success("✅ Mapping deleted")
@@ -608,11 +684,7 @@ def quick_setup_wizard():
     ]
     
     # Check sample files
-    sample_count = 0
-    for pa_file in ['PA0001', 'PA0002', 'PA0006', 'PA0105']:
-        sample_path = os.path.join(SOURCE_SAMPLES_DIR, f"{pa_file}_sample.csv")
-        if os.path.exists(sample_path):
-            sample_count += 1
+    sample_count = count_sample_files()
     steps[1] = ("2. Sample Files", sample_count >= 2, f"Upload PA file samples ({sample_count}/4 uploaded)")
     
     # Final step
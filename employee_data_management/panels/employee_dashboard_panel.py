@@ -1,110 +1,314 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import json
-import psutil
-import os
-from collections import defaultdict
+import time
+import functools
+import weakref
+import bisect
+
+# pandas' C helper behind memory_usage(deep=True); internal, so optional
+try:
+    from pandas._libs.lib import memory_usage_of_objects
+except ImportError:
+    memory_usage_of_objects = None
+
+# Optional: client-side refresh timer component
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
+AUTO_REFRESH_SECONDS = 30
+
+# psutil is imported on first use, see _get_psutil
+_psutil = None
+
+# Reruns within these windows reuse the session's last system readings
+CPU_SAMPLE_SECONDS = 1.0
+MEMORY_SAMPLE_SECONDS = 0.5
+
+# Above this many rows the missing-data percentage is estimated from a sample
+MISSING_SAMPLE_ROWS = 50_000
+
+# Session keys with these prefixes are cleared along with registered temporary keys
+TEMP_KEY_PREFIXES = ('temp_', 'cache_')
+
+# id(df) -> (weak reference, shape, size in MB); entries drop out when the frame is collected
+_FRAME_SIZE_CACHE = {}
+
+def frame_memory_bytes(df):
+    """memory_usage(deep=True) total computed per block: only object and extension blocks have their values walked"""
+    blocks = getattr(getattr(df, '_mgr', None), 'blocks', None)
+    if blocks is None or memory_usage_of_objects is None:
+        return int(df.memory_usage(deep=True).sum())
+    total = df.index.memory_usage(deep=True)
+    for block in blocks:
+        values = block.values
+        # Extension arrays (categorical, string, ...) report their own deep size, as Series.memory_usage uses
+        extension_memory_usage = getattr(values, 'memory_usage', None)
+        if extension_memory_usage is not None:
+            total += extension_memory_usage(deep=True)
+            continue
+        total += values.nbytes
+        if values.dtype == object:
+            total += memory_usage_of_objects(values.ravel())
+    return int(total)
+
+def frame_size_mb(df):
+    """Deep memory size of a DataFrame in MB, measured once per frame object and shape"""
+    key = id(df)
+    cached = _FRAME_SIZE_CACHE.get(key)
+    if cached is not None and cached[0]() is df and cached[1] == df.shape:
+        return cached[2]
+    size_mb = frame_memory_bytes(df) / 1024 / 1024
+    ref = weakref.ref(df, lambda _, key=key: _FRAME_SIZE_CACHE.pop(key, None))
+    _FRAME_SIZE_CACHE[key] = (ref, df.shape, size_mb)
+    return size_mb
+
+if hasattr(st, 'fragment'):
+    @st.fragment(run_every=AUTO_REFRESH_SECONDS)
+    def _refresh_timer():
+        """Timer fragment; reruns the whole dashboard once a full interval has passed since the last full run"""
+        if time.monotonic() - st.session_state.get('_dashboard_rendered_at', 0) >= AUTO_REFRESH_SECONDS - 1:
+            st.rerun()
+else:
+    _refresh_timer = None
+
+def schedule_auto_refresh():
+    """Rerun the dashboard every AUTO_REFRESH_SECONDS without holding the script thread"""
+    if st_autorefresh is not None:
+        st_autorefresh(interval=AUTO_REFRESH_SECONDS * 1000, key="dash_refresh")
+    elif _refresh_timer is not None:
+        st.session_state['_dashboard_rendered_at'] = time.monotonic()
+        _refresh_timer()
+    else:
+        st.caption("Auto-refresh needs the streamlit-autorefresh package or Streamlit 1.37+")
+
+def _get_psutil():
+    """Import psutil on first use and seed its CPU counter, so later interval=None calls report usage since the previous call"""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        psutil.cpu_percent(interval=None)
+        _psutil = psutil
+    return _psutil
+
+def psutil_errors():
+    """Exceptions a psutil reading can raise; psutil.Error (AccessDenied, NoSuchProcess) is not an OSError"""
+    errors = (ImportError, AttributeError, OSError)
+    return errors + (_psutil.Error,) if _psutil is not None else errors
+
+@functools.lru_cache(maxsize=1)
+def format_timestamp(seconds):
+    """Local 'YYYY-mm-dd HH:MM:SS' for a whole-second epoch time; reruns within the same second reuse the string"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
 
 def get_system_performance():
     """Get simple system performance metrics"""
+    now = time.monotonic()
+    
     try:
-        memory_info = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        cpu_sample = st.session_state.get('_last_cpu_sample')
+        if cpu_sample is None or now - cpu_sample[0] > CPU_SAMPLE_SECONDS:
+            # Non-blocking: usage since the previous call instead of sleeping through a fresh interval.
+            # The call right after _get_psutil seeds the counter spans almost no time, so it reads as n/a
+            first_use = _psutil is None
+            cpu_percent = _get_psutil().cpu_percent(interval=None)
+            cpu_sample = (now, None if first_use else cpu_percent)
+            st.session_state['_last_cpu_sample'] = cpu_sample
         
-        return {
-            'memory_used_percent': memory_info.percent,
-            'memory_available_gb': round(memory_info.available / 1024 / 1024 / 1024, 1),
-            'cpu_percent': cpu_percent,
-            'timestamp': datetime.now().isoformat()
-        }
-    except:
+        memory_sample = st.session_state.get('_last_memory_sample')
+        if memory_sample is None or now - memory_sample[0] > MEMORY_SAMPLE_SECONDS:
+            memory_sample = (now, _get_psutil().virtual_memory())
+            st.session_state['_last_memory_sample'] = memory_sample
+    except psutil_errors():
         return {
             'memory_used_percent': 0,
             'memory_available_gb': 0,
             'cpu_percent': 0,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time()
         }
+    
+    memory_info = memory_sample[1]
+    return {
+        'memory_used_percent': memory_info.percent,
+        'memory_available_gb': round(memory_info.available / 1024 / 1024 / 1024, 1),
+        'cpu_percent': cpu_sample[1],
+        'timestamp': time.time()
+    }
+
+def add_file_size(analysis, name, size_mb, rows, columns):
+    """Append one file's figures to the parallel file_sizes columns"""
+    file_sizes = analysis['file_sizes']
+    file_sizes['names'].append(name)
+    file_sizes['size_mb'].append(round(size_mb, 1))
+    file_sizes['rows'].append(rows)
+    file_sizes['columns'].append(columns)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def file_overview_table(names, size_mb, rows, columns):
+    """Data Overview table built column by column, rebuilt only when a file's figures change"""
+    return pd.DataFrame({
+        'File': names,
+        'Size (MB)': [f"{size:.1f}" for size in size_mb],
+        'Records': [f"{count:,}" for count in rows],
+        'Fields': columns,
+        'Status': ['✅ Loaded' if count > 0 else '❌ Empty' for count in rows]
+    })
 
 def analyze_data_size_and_performance(state):
     """Analyze data sizes and their impact on performance"""
     
     analysis = {
         'total_data_size_mb': 0,
-        'file_sizes': {},
+        # Parallel per-file columns, in display order
+        'file_sizes': {'names': [], 'size_mb': [], 'rows': [], 'columns': []},
         'processing_recommendations': [],
         'performance_score': 100
     }
     
-    try:
-        # Analyze source files
-        source_files = ['PA0001', 'PA0002', 'PA0006', 'PA0105']
-        
-        for file_key in source_files:
-            source_data = state.get(f'source_{file_key.lower()}')
-            if source_data is not None and not source_data.empty:
-                try:
-                    size_mb = source_data.memory_usage(deep=True).sum() / 1024 / 1024
-                    analysis['file_sizes'][file_key] = {
-                        'size_mb': round(size_mb, 1),
-                        'rows': len(source_data),
-                        'columns': len(source_data.columns)
-                    }
-                    analysis['total_data_size_mb'] += size_mb
-                except:
-                    analysis['file_sizes'][file_key] = {
-                        'size_mb': 0,
-                        'rows': 0,
-                        'columns': 0
-                    }
-        
-        # Analyze output files
-        output_files = state.get('generated_employee_files', {})
-        if output_files and 'employee_data' in output_files:
+    # Analyze source files
+    source_files = ['PA0001', 'PA0002', 'PA0006', 'PA0105']
+    
+    for file_key in source_files:
+        source_data = state.get(f'source_{file_key.lower()}')
+        if source_data is not None and not source_data.empty:
             try:
-                output_data = output_files['employee_data']
-                output_size_mb = output_data.memory_usage(deep=True).sum() / 1024 / 1024
-                analysis['file_sizes']['Employee Output'] = {
-                    'size_mb': round(output_size_mb, 1),
-                    'rows': len(output_data),
-                    'columns': len(output_data.columns)
-                }
-                analysis['total_data_size_mb'] += output_size_mb
-            except:
-                pass
-        
-        analysis['total_data_size_mb'] = round(analysis['total_data_size_mb'], 1)
-        
-        # Generate performance recommendations
-        if analysis['total_data_size_mb'] > 100:
-            analysis['processing_recommendations'].append("Large dataset detected - processing may take longer")
-            analysis['performance_score'] -= 20
-        
-        if analysis['total_data_size_mb'] > 500:
-            analysis['processing_recommendations'].append("Very large dataset - consider processing in smaller batches")
-            analysis['performance_score'] -= 30
-        
-        # Check for many files
-        if len(analysis['file_sizes']) > 6:
-            analysis['processing_recommendations'].append("Many files loaded - clear unused data to improve performance")
-            analysis['performance_score'] -= 10
-        
-        # Check session state size
-        if hasattr(st, 'session_state'):
-            session_keys = len(st.session_state.keys())
-            if session_keys > 20:
-                analysis['processing_recommendations'].append("Session has many stored items - consider clearing old data")
-                analysis['performance_score'] -= 10
-        
-    except Exception as e:
-        analysis['processing_recommendations'].append(f"Error analyzing data: {str(e)}")
+                size_mb = frame_size_mb(source_data)
+            except Exception:
+                add_file_size(analysis, file_key, 0, 0, 0)
+                continue
+            add_file_size(analysis, file_key, size_mb, len(source_data), len(source_data.columns))
+            analysis['total_data_size_mb'] += size_mb
+    
+    # Analyze output files
+    output_files = state.get('generated_employee_files', {})
+    if output_files and 'employee_data' in output_files:
+        output_data = output_files['employee_data']
+        try:
+            output_size_mb = frame_size_mb(output_data)
+        except Exception:
+            output_size_mb = None
+        if output_size_mb is not None:
+            add_file_size(analysis, 'Employee Output', output_size_mb, len(output_data), len(output_data.columns))
+            analysis['total_data_size_mb'] += output_size_mb
+    
+    analysis['total_data_size_mb'] = round(analysis['total_data_size_mb'], 1)
+    
+    # Generate performance recommendations
+    if analysis['total_data_size_mb'] > 100:
+        analysis['processing_recommendations'].append("Large dataset detected - processing may take longer")
+        analysis['performance_score'] -= 20
+    
+    if analysis['total_data_size_mb'] > 500:
+        analysis['processing_recommendations'].append("Very large dataset - consider processing in smaller batches")
+        analysis['performance_score'] -= 30
+    
+    # Check for many files
+    if len(analysis['file_sizes']['names']) > 6:
+        analysis['processing_recommendations'].append("Many files loaded - clear unused data to improve performance")
+        analysis['performance_score'] -= 10
+    
+    # Check session state size
+    session_keys = len(st.session_state)
+    if session_keys > 20:
+        analysis['processing_recommendations'].append("Session has many stored items - consider clearing old data")
+        analysis['performance_score'] -= 10
     
     return analysis
 
+SYSTEM_STATUS_GRID = """
+<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin-bottom: 1rem;">{cards}</div>
+"""
+
+METRIC_CARD = (
+    '<div title="{help}">'
+    '<div style="font-size: 0.875rem; opacity: 0.8;">{label}</div>'
+    '<div style="font-size: 2.25rem; line-height: 1.4;">{value}</div>'
+    '<div style="font-size: 0.875rem; opacity: 0.6;">{caption}</div>'
+    '</div>'
+)
+
+def metric_card(label, value, help_text, caption):
+    """HTML for one System Status card: label, value and status caption, with the help text as a tooltip"""
+    return METRIC_CARD.format(label=label, value=value, help=help_text.replace('"', '&quot;'), caption=caption)
+
+# Status caption bands per card as (thresholds, captions lowest band first, bisect function).
+# bisect_left keeps a value equal to a threshold in the band below ("above N" limits),
+# bisect_right moves it to the band above ("below N" limits)
+MEMORY_STATUS = ((70, 85), ("😊 Normal usage", "😐 Moderate usage", "⚠️ High usage"), bisect.bisect_left)
+CPU_STATUS = ((50, 80), ("😊 Normal load", "😐 Moderate load", "⚠️ High load"), bisect.bisect_left)
+AVAILABLE_MEMORY_STATUS = ((2, 4), ("⚠️ Low available", "😐 Moderate available", "😊 Plenty available"), bisect.bisect_right)
+DATA_SIZE_STATUS = ((100, 500), ("😊 Small dataset", "😐 Medium dataset", "⚠️ Large dataset"), bisect.bisect_left)
+
+def status_card(label, value, unit, help_text, status):
+    """System Status card for a reading, captioned from its status bands; None shows as not yet sampled"""
+    if value is None:
+        return metric_card(label, "n/a", help_text, "⏳ Sampling, refresh for a reading")
+    thresholds, captions, find_band = status
+    return metric_card(label, f"{value:.1f}{unit}", help_text, captions[find_band(thresholds, value)])
+
+def register_temp_key(key):
+    """Mark a session key as disposable so Clear Session Data removes it"""
+    st.session_state.setdefault('_temp_keys', set()).add(key)
+
+def clear_temp_keys():
+    """Remove registered keys and legacy temp_/cache_ keys from the session; returns how many were removed"""
+    keys = st.session_state.pop('_temp_keys', set())
+    keys.update(key for key in st.session_state.keys() if key.startswith(TEMP_KEY_PREFIXES))
+    cleared = 0
+    for key in keys:
+        if key in st.session_state:
+            del st.session_state[key]
+            cleared += 1
+    return cleared
+
+def frame_fingerprint(df):
+    """Cheap cache key for a loaded frame: identity, shape, columns and a hash of its first and last rows"""
+    edge_hash = int(pd.util.hash_pandas_object(df.iloc[[0, -1]], index=False).sum())
+    return (id(df), df.shape, tuple(df.columns), edge_hash)
+
+@st.cache_data(ttl=60, max_entries=8, show_spinner=False)
+def frame_quality(fingerprint, _df):
+    """Duplicate employee IDs and missing-cell percentage of a frame, cached on its fingerprint"""
+    # Rows repeating an earlier ID, counted from the unique-value hashtable without a boolean mask
+    duplicates = len(_df) - _df['Pers.No.'].nunique(dropna=False) if 'Pers.No.' in _df.columns else 0
+    # One reduction over the boolean mask; large frames are estimated from a fixed-seed row sample,
+    # which is well within the precision the 30% warning threshold needs
+    sample = _df if len(_df) <= MISSING_SAMPLE_ROWS else _df.sample(n=MISSING_SAMPLE_ROWS, random_state=0)
+    missing_pct = float(sample.isna().to_numpy().mean()) * 100
+    return duplicates, missing_pct
+
+def health_fingerprint(state):
+    """Content fingerprints of the inputs check_data_health looks at, so a recycled id with the same shape still misses"""
+    pa0002 = state.get('source_pa0002')
+    pa0001 = state.get('source_pa0001')
+    output_files = state.get('generated_employee_files', {})
+    return (
+        frame_fingerprint(pa0002) if pa0002 is not None and not pa0002.empty else None,
+        frame_fingerprint(pa0001) if pa0001 is not None and not pa0001.empty else None,
+        bool(output_files) and 'employee_data' in output_files
+    )
+
 def check_data_health(state):
+    """Check overall health of employee data, reusing the last result while the inputs are unchanged"""
+    try:
+        fingerprint = health_fingerprint(state)
+    except Exception:
+        # Frames that cannot be hashed (e.g. list cells) skip the cache; compute_data_health reports the error
+        return compute_data_health(state)
+    if st.session_state.pop('force_health_refresh', False):
+        frame_quality.clear()
+    elif st.session_state.get('_health_fingerprint') == fingerprint:
+        return st.session_state['_health_status']
+    
+    health_status = compute_data_health(state)
+    st.session_state['_health_fingerprint'] = fingerprint
+    st.session_state['_health_status'] = health_status
+    register_temp_key('_health_fingerprint')
+    register_temp_key('_health_status')
+    return health_status
+
+def compute_data_health(state):
     """Check overall health of employee data"""
     
     health_status = {
@@ -115,64 +319,63 @@ def check_data_health(state):
         'status': 'healthy'
     }
     
-    try:
-        # Check if required files are present
-        pa0002 = state.get('source_pa0002')
-        pa0001 = state.get('source_pa0001')
-        
-        if pa0002 is None or pa0002.empty:
-            health_status['issues'].append("Missing PA0002 (Personal Data) - Required for processing")
-            health_status['overall_score'] -= 40
+    # Check if required files are present
+    pa0002 = state.get('source_pa0002')
+    pa0001 = state.get('source_pa0001')
+    
+    if pa0002 is None or pa0002.empty:
+        health_status['issues'].append("Missing PA0002 (Personal Data) - Required for processing")
+        health_status['overall_score'] -= 40
+    
+    if pa0001 is None or pa0001.empty:
+        health_status['issues'].append("Missing PA0001 (Work Info) - Required for processing")
+        health_status['overall_score'] -= 30
+    
+    # Check for output file
+    output_files = state.get('generated_employee_files', {})
+    if not output_files or 'employee_data' not in output_files:
+        health_status['warnings'].append("No employee output file generated yet")
+        health_status['overall_score'] -= 10
+    
+    # Check data quality if files exist
+    if pa0002 is not None and not pa0002.empty:
+        try:
+            duplicates, missing_pct = frame_quality(frame_fingerprint(pa0002), pa0002)
+        except Exception as e:
+            health_status['issues'].append(f"Error checking data health: {str(e)}")
+            health_status['overall_score'] = 0
+            health_status['status'] = 'error'
+            return health_status
         
-        if pa0001 is None or pa0001.empty:
-            health_status['issues'].append("Missing PA0001 (Work Info) - Required for processing")
-            health_status['overall_score'] -= 30
+        # Check for duplicates
+        if duplicates:
+            health_status['warnings'].append(f"Found {duplicates} duplicate employee IDs in PA0002")
+            health_status['overall_score'] -= 15
         
-        # Check for output file
-        output_files = state.get('generated_employee_files', {})
-        if not output_files or 'employee_data' not in output_files:
-            health_status['warnings'].append("No employee output file generated yet")
+        # Check for missing data
+        if missing_pct > 30:
+            health_status['warnings'].append(f"PA0002 has {missing_pct:.1f}% missing data")
             health_status['overall_score'] -= 10
-        
-        # Check data quality if files exist
-        if pa0002 is not None and not pa0002.empty:
-            # Check for duplicates
-            if 'Pers.No.' in pa0002.columns:
-                duplicates = pa0002['Pers.No.'].duplicated().sum()
-                if duplicates > 0:
-                    health_status['warnings'].append(f"Found {duplicates} duplicate employee IDs in PA0002")
-                    health_status['overall_score'] -= 15
-            
-            # Check for missing data
-            missing_pct = (pa0002.isnull().sum().sum() / (len(pa0002) * len(pa0002.columns))) * 100
-            if missing_pct > 30:
-                health_status['warnings'].append(f"PA0002 has {missing_pct:.1f}% missing data")
-                health_status['overall_score'] -= 10
-        
-        # Generate recommendations
-        if health_status['overall_score'] < 70:
-            health_status['recommendations'].append("Fix critical issues before processing employee data")
-        
-        if health_status['warnings']:
-            health_status['recommendations'].append("Review warnings to improve data quality")
-        
-        if not health_status['issues'] and not health_status['warnings']:
-            health_status['recommendations'].append("Data looks good! Ready for processing")
-        
-        # Determine overall status
-        if health_status['overall_score'] >= 90:
-            health_status['status'] = 'excellent'
-        elif health_status['overall_score'] >= 70:
-            health_status['status'] = 'good'
-        elif health_status['overall_score'] >= 50:
-            health_status['status'] = 'warning'
-        else:
-            health_status['status'] = 'critical'
     
-    except Exception as e:
-        health_status['issues'].append(f"Error checking data health: {str(e)}")
-        health_status['overall_score'] = 0
-        health_status['status'] = 'error'
+    # Generate recommendations
+    if health_status['overall_score'] < 70:
+        health_status['recommendations'].append("Fix critical issues before processing employee data")
+    
+    if health_status['warnings']:
+        health_status['recommendations'].append("Review warnings to improve data quality")
+    
+    if not health_status['issues'] and not health_status['warnings']:
+        health_status['recommendations'].append("Data looks good! Ready for processing")
+    
+    # Determine overall status
+    if health_status['overall_score'] >= 90:
+        health_status['status'] = 'excellent'
+    elif health_status['overall_score'] >= 70:
+        health_status['status'] = 'good'
+    elif health_status['overall_score'] >= 50:
+        health_status['status'] = 'warning'
+    else:
+        health_status['status'] = 'critical'
     
     return health_status
 
@@ -198,63 +401,18 @@ def show_employee_dashboard_panel(state):
     # System Status Overview
     st.subheader("🖥️ System Status")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        memory_pct = system_perf['memory_used_percent']
-        st.metric(
-            "Memory Usage", 
-            f"{memory_pct:.1f}%",
-            help="How much of your computer's memory is being used"
-        )
-        if memory_pct > 85:
-            st.caption("⚠️ High usage")
-        elif memory_pct > 70:
-            st.caption("😐 Moderate usage")
-        else:
-            st.caption("😊 Normal usage")
-    
-    with col2:
-        cpu_pct = system_perf['cpu_percent']
-        st.metric(
-            "CPU Usage", 
-            f"{cpu_pct:.1f}%",
-            help="How hard your computer is working"
-        )
-        if cpu_pct > 80:
-            st.caption("⚠️ High load")
-        elif cpu_pct > 50:
-            st.caption("😐 Moderate load")
-        else:
-            st.caption("😊 Normal load")
-    
-    with col3:
-        available_memory = system_perf['memory_available_gb']
-        st.metric(
-            "Available Memory", 
-            f"{available_memory:.1f} GB",
-            help="Free memory available for processing"
-        )
-        if available_memory < 2:
-            st.caption("⚠️ Low available")
-        elif available_memory < 4:
-            st.caption("😐 Moderate available")
-        else:
-            st.caption("😊 Plenty available")
-    
-    with col4:
-        data_size = data_analysis['total_data_size_mb']
-        st.metric(
-            "Data Size", 
-            f"{data_size:.1f} MB",
-            help="Total size of your loaded employee data"
-        )
-        if data_size > 500:
-            st.caption("⚠️ Large dataset")
-        elif data_size > 100:
-            st.caption("😐 Medium dataset")
-        else:
-            st.caption("😊 Small dataset")
+    # All four cards go out as one markdown element
+    cards = "".join([
+        status_card("Memory Usage", system_perf['memory_used_percent'], "%",
+                    "How much of your computer's memory is being used", MEMORY_STATUS),
+        status_card("CPU Usage", system_perf['cpu_percent'], "%",
+                    "How hard your computer is working", CPU_STATUS),
+        status_card("Available Memory", system_perf['memory_available_gb'], " GB",
+                    "Free memory available for processing", AVAILABLE_MEMORY_STATUS),
+        status_card("Data Size", data_analysis['total_data_size_mb'], " MB",
+                    "Total size of your loaded employee data", DATA_SIZE_STATUS)
+    ])
+    st.markdown(SYSTEM_STATUS_GRID.format(cards=cards), unsafe_allow_html=True)
     
     # Data Health Status
     st.subheader("📊 Data Health Check")
@@ -303,28 +461,22 @@ def show_employee_dashboard_panel(state):
     # Data Overview
     st.subheader("📂 Data Overview")
     
-    if data_analysis['file_sizes']:
+    file_sizes = data_analysis['file_sizes']
+    if file_sizes['names']:
         st.info("**What this shows:** Size and structure of your loaded employee data files")
         
         # Create data overview table
-        file_data = []
-        for file_name, file_info in data_analysis['file_sizes'].items():
-            file_data.append({
-                'File': file_name,
-                'Size (MB)': f"{file_info['size_mb']:.1f}",
-                'Records': f"{file_info['rows']:,}",
-                'Fields': file_info['columns'],
-                'Status': '✅ Loaded' if file_info['rows'] > 0 else '❌ Empty'
-            })
-        
-        file_df = pd.DataFrame(file_data)
+        file_df = file_overview_table(
+            tuple(file_sizes['names']), tuple(file_sizes['size_mb']),
+            tuple(file_sizes['rows']), tuple(file_sizes['columns'])
+        )
         st.dataframe(file_df, use_container_width=True)
         
         # Show total summary
-        total_records = sum(info['rows'] for info in data_analysis['file_sizes'].values())
+        total_records = sum(file_sizes['rows'])
         total_size = data_analysis['total_data_size_mb']
         
-        st.caption(f"**Total:** {total_size:.1f} MB across {total_records:,} records in {len(data_analysis['file_sizes'])} files")
+        st.caption(f"**Total:** {total_size:.1f} MB across {total_records:,} records in {len(file_sizes['names'])} files")
     else:
         st.warning("No employee data files loaded yet")
         st.info("**What to do:** Go to Employee panel → Upload your PA files → Return here to monitor performance")
@@ -337,18 +489,10 @@ def show_employee_dashboard_panel(state):
     with col1:
         if st.button("🧹 Clear Session Data", help="Free up memory by clearing old data"):
             # Clear non-essential session state items
-            keys_to_clear = []
-            if hasattr(st, 'session_state'):
-                for key in st.session_state.keys():
-                    if 'temp' in key.lower() or 'cache' in key.lower():
-                        keys_to_clear.append(key)
+            cleared = clear_temp_keys()
             
-            for key in keys_to_clear:
-                if key in st.session_state:
-                    del st.session_state[key]
-            
-            if keys_to_clear:
-                st.success(f"Cleared {len(keys_to_clear)} temporary items")
+            if cleared:
+                st.success(f"Cleared {cleared} temporary items")
             else:
                 st.info("No temporary items to clear")
     
@@ -394,26 +538,25 @@ def show_employee_dashboard_panel(state):
     with st.expander("🔧 System Information", expanded=False):
         st.markdown("**Technical Details:**")
         
+        # Session state info
+        session_keys = len(st.session_state)
+        st.write(f"**Session State Items:** {session_keys}")
+        
+        # File info
+        loaded_files = len(data_analysis['file_sizes']['names'])
+        st.write(f"**Loaded Files:** {loaded_files}")
+        
+        # Memory details
         try:
-            # Session state info
-            if hasattr(st, 'session_state'):
-                session_keys = len(st.session_state.keys())
-                st.write(f"**Session State Items:** {session_keys}")
-            
-            # File info
-            loaded_files = len(data_analysis['file_sizes'])
-            st.write(f"**Loaded Files:** {loaded_files}")
-            
-            # Memory details
-            memory_info = psutil.virtual_memory()
+            memory_info = _get_psutil().virtual_memory()
+        except psutil_errors() as e:
+            st.write(f"**System Info Error:** {str(e)}")
+        else:
             st.write(f"**Total System Memory:** {memory_info.total / 1024 / 1024 / 1024:.1f} GB")
             st.write(f"**Used System Memory:** {memory_info.used / 1024 / 1024 / 1024:.1f} GB")
-            
-            # Timestamp
-            st.write(f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            
-        except Exception as e:
-            st.write(f"**System Info Error:** {str(e)}")
+        
+        # Timestamp
+        st.write(f"**Last Updated:** {format_timestamp(int(system_perf['timestamp']))}")
     
     # Auto-refresh option
     st.markdown("---")
@@ -425,7 +568,4 @@ def show_employee_dashboard_panel(state):
     )
     
     if auto_refresh:
-        # Simple auto-refresh mechanism
-        import time
-        time.sleep(30)
-        st.rerun()
+        schedule_auto_refresh()
@@ -12,6 +12,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
 import base64
+import weakref
 
 # Enterprise-grade constants
 CHUNK_SIZE = 5000  # Process in chunks for memory efficiency
@@ -27,50 +28,72 @@ def clean_employee_id(emp_id):
     cleaned = str(emp_id).replace(',', '').replace(' ', '').strip()
     return cleaned
 
+def _clean_id_series(s):
+    """clean_employee_id applied to a whole Series with vectorized string ops; missing IDs become ''"""
+    return (s.where(s.notna(), '').astype(str)
+            .str.replace(',', '', regex=False).str.replace(' ', '', regex=False).str.strip())
+
 # ===== FLEXIBLE COLUMN DETECTION FUNCTIONS =====
 
+# Exact employee ID column names, in order of preference
+EMPLOYEE_ID_EXACT_MATCHES = [
+    'Pers.No.',    # Expected format
+    'Pers.No',     # Without dot
+    'PersonNo',    # Without spaces/dots
+    'Employee ID', # English format
+    'EmpID',       # Short form
+    'EmployeeID',  # No space
+    'Staff ID',    # Alternative
+    'ID',          # Generic
+    'Employee Number',
+    'Emp No',
+    'Personnel Number'
+]
+
+# Lowercase fragments that indicate an employee ID column
+EMPLOYEE_ID_PATTERNS = [
+    'pers.no', 'pers no', 'persno', 'person no', 'person number',
+    'emp id', 'empid', 'employee id', 'employee number', 'emp no',
+    'staff id', 'staff number', 'staff no',
+    'worker id', 'worker number',
+    'personnel id', 'personnel number'
+]
+
+# id(df) -> (weak reference, columns Index, detected column); entries drop out when the frame is collected
+_ID_COLUMN_CACHE = {}
+
 def find_employee_id_column(df):
-    """Dynamically find the employee ID column regardless of exact name"""
+    """Dynamically find the employee ID column regardless of exact name, detected once per frame and column set"""
     if df is None or df.empty:
         return None
     
-    # Try exact matches first (in order of preference)
-    exact_matches = [
-        'Pers.No.',    # Expected format
-        'Pers.No',     # Without dot
-        'PersonNo',    # Without spaces/dots
-        'Employee ID', # English format
-        'EmpID',       # Short form
-        'EmployeeID',  # No space
-        'Staff ID',    # Alternative
-        'ID',          # Generic
-        'Employee Number',
-        'Emp No',
-        'Personnel Number'
-    ]
+    key = id(df)
+    cached = _ID_COLUMN_CACHE.get(key)
+    if cached is not None and cached[0]() is df and cached[1] is df.columns:
+        return cached[2]
     
-    for col in exact_matches:
+    col = detect_employee_id_column(df)
+    ref = weakref.ref(df, lambda _, key=key: _ID_COLUMN_CACHE.pop(key, None))
+    _ID_COLUMN_CACHE[key] = (ref, df.columns, col)
+    return col
+
+def detect_employee_id_column(df):
+    """Scan a frame's columns for the employee ID column"""
+    # Try exact matches first (in order of preference)
+    for col in EMPLOYEE_ID_EXACT_MATCHES:
         if col in df.columns:
             return col
     
+    # Lowercased names, computed once for both scans below
+    lowered_columns = [(col, col.lower().strip()) for col in df.columns]
+    
     # Try partial matches (case insensitive)
-    for col in df.columns:
-        col_lower = col.lower().strip()
-        # Look for patterns that indicate employee ID
-        patterns = [
-            'pers.no', 'pers no', 'persno', 'person no', 'person number',
-            'emp id', 'empid', 'employee id', 'employee number', 'emp no',
-            'staff id', 'staff number', 'staff no',
-            'worker id', 'worker number',
-            'personnel id', 'personnel number'
-        ]
-        
-        if any(pattern in col_lower for pattern in patterns):
+    for col, col_lower in lowered_columns:
+        if any(pattern in col_lower for pattern in EMPLOYEE_ID_PATTERNS):
             return col
     
     # Last resort: look for columns with numeric-like data that might be IDs
-    for col in df.columns:
-        col_lower = col.lower().strip()
+    for col, col_lower in lowered_columns:
         if (('id' in col_lower or 'no' in col_lower or 'number' in col_lower) and 
             len(col_lower) < 20):  # Avoid very long column names
             # Check if this column has numeric/ID-like data
@@ -131,8 +154,7 @@ def debug_data_availability(state):
             if detected_id_col:
                 st.success(f"🎯 **Detected Employee ID Column:** `{detected_id_col}`")
                 # Clean sample IDs before display
-                sample_data = data[detected_id_col].head(5)
-                clean_sample_ids = [clean_employee_id(id) for id in sample_data.tolist()]
+                clean_sample_ids = _clean_id_series(data[detected_id_col].head(5)).tolist()
                 st.write(f"**Sample Employee IDs (cleaned):** {clean_sample_ids}")
             else:
                 st.warning("❌ No employee ID column detected")
@@ -145,7 +167,7 @@ def debug_data_availability(state):
                 
                 # Clean any ID columns for display
                 if detected_id_col and detected_id_col in display_data.columns:
-                    display_data[detected_id_col] = display_data[detected_id_col].apply(clean_employee_id)
+                    display_data[detected_id_col] = _clean_id_series(display_data[detected_id_col])
                 
                 st.dataframe(display_data, use_container_width=True)
         
@@ -175,7 +197,7 @@ def debug_data_availability(state):
             # Show sample clean IDs from output
             for col_name in ['USERID', 'USER_ID', 'EMP_ID', 'EMPLOYEE_ID', 'ID']:
                 if col_name in emp_data.columns:
-                    sample_output_ids = emp_data[col_name].head(3).apply(clean_employee_id).tolist()
+                    sample_output_ids = _clean_id_series(emp_data[col_name].head(3)).tolist()
                     st.write(f"**Sample Output IDs ({col_name}):** {sample_output_ids}")
                     break
     else:
@@ -194,11 +216,8 @@ def get_sample_employee_ids(state, count=10):
         return []
     
     try:
-        # FIXED: Ensure IDs are strings without number formatting
-        sample_ids = pa0002_data[id_col].head(count).astype(str).tolist()
-        # Remove any commas that might have been added by pandas formatting
-        clean_ids = [clean_employee_id(id) for id in sample_ids]
-        return clean_ids
+        # FIXED: Ensure IDs are strings without number formatting or commas
+        return _clean_id_series(pa0002_data[id_col].head(count)).tolist()
     except Exception as e:
         st.error(f"Error getting sample IDs: {str(e)}")
         return []
@@ -238,7 +257,7 @@ def analyze_single_employee_detailed(emp_id, state):
     # Search for employee in PA0002
     try:
         # FIXED: Clean both the search ID and the data IDs for comparison
-        pa0002_clean_ids = pa0002_df[pa0002_id_col].astype(str).str.replace(',', '').str.strip()
+        pa0002_clean_ids = _clean_id_series(pa0002_df[pa0002_id_col])
         employee_row = pa0002_df[pa0002_clean_ids == emp_id]
         
         if not employee_row.empty:
@@ -307,7 +326,7 @@ def analyze_single_employee_detailed(emp_id, state):
             if file_id_col is not None:
                 try:
                     # FIXED: Clean IDs for comparison
-                    file_clean_ids = file_df[file_id_col].astype(str).str.replace(',', '').str.strip()
+                    file_clean_ids = _clean_id_series(file_df[file_id_col])
                     employee_records = file_df[file_clean_ids == emp_id]
                     
                     if not employee_records.empty:
@@ -383,7 +402,7 @@ def analyze_single_employee_detailed(emp_id, state):
         if output_id_col is not None:
             try:
                 # FIXED: Clean output IDs for comparison
-                output_clean_ids = output_data[output_id_col].astype(str).str.replace(',', '').str.strip()
+                output_clean_ids = _clean_id_series(output_data[output_id_col])
                 output_records = output_data[output_clean_ids == emp_id]
                 
                 if not output_records.empty:
@@ -474,10 +493,6 @@ def run_bulk_employee_analysis(state):
     total_employees = len(pa0002_df)
     st.info(f"🚀 **Starting bulk analysis of {total_employees:,} employees...**")
     
-    # Create progress tracking
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
     # Initialize analysis results
     bulk_results = {
         'total_employees': total_employees,
@@ -495,47 +510,43 @@ def run_bulk_employee_analysis(state):
         'sample_problems': []
     }
     
-    # FIXED: Get clean employee ID sets for fast lookups
-    pa0002_clean_ids = set(pa0002_df[pa0002_id_col].astype(str).str.replace(',', '').str.strip())
+    # FIXED: Clean employee IDs, as a Series aligned with the name column below
+    all_clean_ids = _clean_id_series(pa0002_df[pa0002_id_col]).reset_index(drop=True)
+    pa0002_unique_count = all_clean_ids.nunique()
     
-    # Check other files with clean IDs
-    pa0001_ids = set()
+    # Unique clean IDs of the other files, as Indexes for bulk isin lookups
+    pa0001_ids = pd.Index([], dtype=object)
     pa0001_id_col = None
     if pa0001_df is not None:
         pa0001_id_col = find_employee_id_column(pa0001_df)
         if pa0001_id_col:
-            pa0001_ids = set(pa0001_df[pa0001_id_col].astype(str).str.replace(',', '').str.strip())
+            pa0001_ids = pd.Index(_clean_id_series(pa0001_df[pa0001_id_col])).unique()
     
-    pa0006_ids = set()
+    pa0006_ids = pd.Index([], dtype=object)
     pa0006_id_col = None
     if pa0006_df is not None:
         pa0006_id_col = find_employee_id_column(pa0006_df)
         if pa0006_id_col:
-            pa0006_ids = set(pa0006_df[pa0006_id_col].astype(str).str.replace(',', '').str.strip())
+            pa0006_ids = pd.Index(_clean_id_series(pa0006_df[pa0006_id_col])).unique()
     
-    pa0105_ids = set()
+    pa0105_ids = pd.Index([], dtype=object)
     pa0105_id_col = None
     if pa0105_df is not None:
         pa0105_id_col = find_employee_id_column(pa0105_df)
         if pa0105_id_col:
-            pa0105_ids = set(pa0105_df[pa0105_id_col].astype(str).str.replace(',', '').str.strip())
+            pa0105_ids = pd.Index(_clean_id_series(pa0105_df[pa0105_id_col])).unique()
     
     # Check output file with clean IDs
-    output_ids = set()
+    output_ids = pd.Index([], dtype=object)
     output_id_col = None
     if output_files and 'employee_data' in output_files:
         output_data = output_files['employee_data']
         for col_name in ['USERID', 'USER_ID', 'EMP_ID', 'EMPLOYEE_ID', 'ID']:
             if col_name in output_data.columns:
                 output_id_col = col_name
-                output_ids = set(output_data[col_name].astype(str).str.replace(',', '').str.strip())
+                output_ids = pd.Index(_clean_id_series(output_data[col_name])).unique()
                 break
     
-    # Process employees in chunks for better performance
-    chunk_size = 1000
-    # FIXED: Get clean employee IDs list
-    all_employee_ids = pa0002_df[pa0002_id_col].astype(str).str.replace(',', '').str.strip().tolist()
-    
     # Get employee names for better reporting
     first_name_col = None
     last_name_col = None
@@ -550,89 +561,76 @@ def run_bulk_employee_analysis(state):
     
     if first_name_col and last_name_col:
         employee_names = (pa0002_df[first_name_col].fillna('Unknown') + ' ' + 
-                         pa0002_df[last_name_col].fillna('Unknown')).tolist()
+                         pa0002_df[last_name_col].fillna('Unknown')).reset_index(drop=True)
     else:
-        employee_names = ['Unknown'] * len(all_employee_ids)
+        employee_names = pd.Series('Unknown', index=all_clean_ids.index)
+    
+    # Presence of every employee in each file, one hashtable lookup pass per file
+    presence = pd.DataFrame({
+        'id': all_clean_ids,
+        'name': employee_names,
+        'in_pa0001': all_clean_ids.isin(pa0001_ids),
+        'in_pa0006': all_clean_ids.isin(pa0006_ids),
+        'in_pa0105': all_clean_ids.isin(pa0105_ids),
+        'in_output': all_clean_ids.isin(output_ids)
+    })
+    
+    statistics = bulk_results['statistics']
+    statistics['missing_pa0001'] = int((~presence['in_pa0001']).sum())
+    statistics['missing_pa0006'] = int((~presence['in_pa0006']).sum())
+    statistics['missing_pa0105'] = int((~presence['in_pa0105']).sum())
+    statistics['missing_output'] = int((~presence['in_output']).sum())
+    
+    # Categorize employees: minimum requirements are PA0001 and the output file
+    success_mask = presence['in_pa0001'] & presence['in_output']
+    statistics['success_count'] = int(success_mask.sum())
+    statistics['error_count'] = total_employees - statistics['success_count']
+    
+    successful = presence[success_mask].assign(
+        files_found=1 + presence['in_pa0001'].astype(int) + presence['in_pa0006'].astype(int)
+                    + presence['in_pa0105'].astype(int)
+    )
+    bulk_results['successful_employees'] = successful[['id', 'name', 'files_found', 'in_output']].to_dict('records')
+    
+    # Issue and file lists are only built for the problem rows
+    problems = presence[~success_mask]
+    bulk_results['problematic_employees'] = [
+        {
+            'id': emp_id,
+            'name': emp_name,
+            'issues': [issue for issue, missing in [
+                ("Missing Work Info (PA0001)", not in_pa0001),
+                ("Missing Address (PA0006)", not in_pa0006),
+                ("Missing Contact (PA0105)", not in_pa0105),
+                ("Missing from Output File", not in_output)
+            ] if missing],
+            'files_found': [f for f, found in [
+                ('PA0002', True), ('PA0001', in_pa0001),
+                ('PA0006', in_pa0006), ('PA0105', in_pa0105)
+            ] if found],
+            'in_output': bool(in_output)
+        }
+        for emp_id, emp_name, in_pa0001, in_pa0006, in_pa0105, in_output in zip(
+            problems['id'], problems['name'], problems['in_pa0001'],
+            problems['in_pa0006'], problems['in_pa0105'], problems['in_output']
+        )
+    ]
     
-    # Process in chunks
-    for i in range(0, len(all_employee_ids), chunk_size):
-        chunk_ids = all_employee_ids[i:i+chunk_size]
-        chunk_names = employee_names[i:i+chunk_size]
-        
-        for emp_id, emp_name in zip(chunk_ids, chunk_names):
-            # Clean the ID for consistency
-            clean_emp_id = clean_employee_id(emp_id)
-            
-            # Check presence in each file using clean IDs
-            in_pa0001 = clean_emp_id in pa0001_ids
-            in_pa0006 = clean_emp_id in pa0006_ids
-            in_pa0105 = clean_emp_id in pa0105_ids
-            in_output = clean_emp_id in output_ids
-            
-            # Determine employee status
-            issues = []
-            if not in_pa0001:
-                issues.append("Missing Work Info (PA0001)")
-                bulk_results['statistics']['missing_pa0001'] += 1
-            if not in_pa0006:
-                issues.append("Missing Address (PA0006)")
-                bulk_results['statistics']['missing_pa0006'] += 1
-            if not in_pa0105:
-                issues.append("Missing Contact (PA0105)")
-                bulk_results['statistics']['missing_pa0105'] += 1
-            if not in_output:
-                issues.append("Missing from Output File")
-                bulk_results['statistics']['missing_output'] += 1
-            
-            # Categorize employee
-            if in_pa0001 and in_output:  # Minimum requirements met
-                bulk_results['statistics']['success_count'] += 1
-                bulk_results['successful_employees'].append({
-                    'id': clean_emp_id,  # Store clean ID
-                    'name': emp_name,
-                    'files_found': sum([True, in_pa0001, in_pa0006, in_pa0105]),
-                    'in_output': in_output
-                })
-            else:
-                bulk_results['statistics']['error_count'] += 1
-                problem_record = {
-                    'id': clean_emp_id,  # Store clean ID
-                    'name': emp_name,
-                    'issues': issues,
-                    'files_found': [f for f, found in [
-                        ('PA0002', True), ('PA0001', in_pa0001), 
-                        ('PA0006', in_pa0006), ('PA0105', in_pa0105)
-                    ] if found],
-                    'in_output': in_output
-                }
-                bulk_results['problematic_employees'].append(problem_record)
-                
-                # Keep first 100 problems for detailed display
-                if len(bulk_results['sample_problems']) < 100:
-                    bulk_results['sample_problems'].append(problem_record)
-        
-        # Update progress
-        processed = min(i + chunk_size, len(all_employee_ids))
-        progress = processed / len(all_employee_ids)
-        progress_bar.progress(progress)
-        status_text.text(f"Processed {processed:,} of {len(all_employee_ids):,} employees...")
+    # Keep first 100 problems for detailed display
+    bulk_results['sample_problems'] = bulk_results['problematic_employees'][:100]
     
     # Calculate final statistics
     bulk_results['file_coverage'] = {
         'PA0002': 100.0,  # Base file
-        'PA0001': round((len(pa0001_ids) / len(pa0002_clean_ids) * 100), 1) if pa0002_clean_ids else 0,
-        'PA0006': round((len(pa0006_ids) / len(pa0002_clean_ids) * 100), 1) if pa0002_clean_ids else 0,
-        'PA0105': round((len(pa0105_ids) / len(pa0002_clean_ids) * 100), 1) if pa0002_clean_ids else 0,
-        'Output': round((len(output_ids) / len(pa0002_clean_ids) * 100), 1) if pa0002_clean_ids else 0
+        'PA0001': round((len(pa0001_ids) / pa0002_unique_count * 100), 1) if pa0002_unique_count else 0,
+        'PA0006': round((len(pa0006_ids) / pa0002_unique_count * 100), 1) if pa0002_unique_count else 0,
+        'PA0105': round((len(pa0105_ids) / pa0002_unique_count * 100), 1) if pa0002_unique_count else 0,
+        'Output': round((len(output_ids) / pa0002_unique_count * 100), 1) if pa0002_unique_count else 0
     }
     
     # Store results in session state for later use
     st.session_state['bulk_analysis_results'] = bulk_results
     
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
-    
     return bulk_results
 
 def display_bulk_analysis_results(results):
@@ -1377,7 +1375,7 @@ def show_enhanced_data_drill_down(missing_data, df, column_name, data_samples):
                     display_missing = missing_rows[context_cols].copy()
                     # Clean any employee IDs
                     if id_col and id_col in display_missing.columns:
-                        display_missing[id_col] = display_missing[id_col].apply(clean_employee_id)
+                        display_missing[id_col] = _clean_id_series(display_missing[id_col])
                     display_missing[f'{column_name} (STATUS)'] = '❌ EMPTY'
                     st.dataframe(display_missing, use_container_width=True)
     